@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import find_packages, setup
 
 setup(
     name="rednit.py",
@@ -9,7 +9,9 @@ setup(
     author_email="faulie50@gmail.com",
     url="https://github.com/rednit-team/tinder.py",
     keywords="tinder tinder-api rest-api api wrapper api-client library framework",
+    packages=find_packages(),
     install_requires=["requests"],
+    entry_points={"console_scripts": ["tinder-py=tinder.cli:main"]},
     long_description_content_type="text/markdown",
     long_description=open("./README.md", "rt").read(),
     classifiers=[
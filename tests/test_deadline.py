@@ -0,0 +1,65 @@
+import threading
+
+from tinder.deadline import CancellationToken, Deadline, current_deadline
+
+
+def test_threads_exit_shared_deadline_out_of_order():
+    deadline = Deadline(30)
+    first_entered = threading.Event()
+    second_entered = threading.Event()
+    first_exited = threading.Event()
+    errors = []
+
+    def first():
+        try:
+            with deadline:
+                first_entered.set()
+                second_entered.wait(5)
+            assert current_deadline() is None
+        except Exception as error:
+            errors.append(error)
+        finally:
+            first_exited.set()
+
+    def second():
+        try:
+            first_entered.wait(5)
+            with deadline:
+                second_entered.set()
+                # the first thread leaves the block while this one is still inside
+                first_exited.wait(5)
+                assert current_deadline().remaining() <= 30
+            assert current_deadline() is None
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_nested_deadline_keeps_enclosing_limit():
+    token = CancellationToken()
+    outer = Deadline(1, token)
+    inner = Deadline(60)
+    with outer:
+        with inner as block:
+            assert block.remaining() <= 1
+            token.cancel()
+            assert block.cancelled
+        assert current_deadline().remaining() <= 1
+    assert current_deadline() is None
+    assert inner.remaining() > 1
+    assert not inner.cancelled
+
+
+def test_reentering_the_same_deadline():
+    deadline = Deadline(10)
+    with deadline as outer:
+        with deadline as inner:
+            assert current_deadline() is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
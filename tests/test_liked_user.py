@@ -0,0 +1,32 @@
+from tinder.benchmarks import fixtures
+from tinder.entities.user import LikedUser
+
+
+def test_like_fields_are_read_from_the_result():
+    like = fixtures.liked_user(3)
+    user = LikedUser(like, None)
+    assert user.id == like["user"]["_id"]
+    assert user.name == like["user"]["name"]
+    assert user.distance_mi == like["distance_mi"]
+    assert user.s_number == like["s_number"]
+    assert [t.value for t in user.teasers] == [t["string"] for t in like["teasers"]]
+    assert user.content_hash == like["content_hash"]
+    assert "distance_mi" not in like["user"]
+
+
+def test_flat_result_is_accepted():
+    like = fixtures.liked_user(3)
+    flat = {**like, **like["user"]}
+    del flat["user"]
+    user = LikedUser(flat, None)
+    assert user.id == like["user"]["_id"]
+    assert user.distance_mi == like["distance_mi"]
+
+
+def test_refresh_reads_the_like_fields():
+    like = fixtures.liked_user(3)
+    user = LikedUser(like, None)
+    like = dict(like, distance_mi=like["distance_mi"] + 5, expire_time=1893456060000)
+    user.refresh(like)
+    assert user.distance_mi == like["distance_mi"]
+    assert user.expire_time.timestamp() == 1893456060
@@ -0,0 +1,112 @@
+import time
+
+from tinder.entities.message import Message
+from tinder.exceptions import RequestFailed
+from tinder.outbox import Outbox
+
+self_id = "s" * 24
+match_id = "m" * 24
+
+
+class _SelfUser:
+    id = self_id
+
+
+class _Client:
+    """
+    Answers the first `lost` sends with an error after storing them, and the first `dropped`
+    sends with an error without storing them.
+    """
+
+    def __init__(self, history=(), lost: int = 0, dropped: int = 0):
+        self.history = list(history)
+        self.lost = lost
+        self.dropped = dropped
+        self.sends = 0
+
+    def get_self_user(self):
+        return _SelfUser()
+
+    def get_recent_messages(self, match_id: str):
+        return tuple(reversed(self.history))
+
+    def send_message(self, match_id: str, content: str, retry: bool = True):
+        if self.dropped > 0:
+            self.dropped -= 1
+            raise RequestFailed(None)
+        self.sends += 1
+        sent = _message(f"sent{self.sends}", self_id, content, int(time.time() * 1000))
+        self.history.append(sent)
+        if self.lost > 0:
+            self.lost -= 1
+            raise RequestFailed(None)
+        return sent
+
+
+def _message(message_id: str, author_id: str, content: str, sent_at: int) -> Message:
+    raw = {
+        "_id": message_id,
+        "match_id": match_id,
+        "sent_date": sent_at,
+        "message": content,
+        "from": author_id,
+        "to": match_id,
+        "timestamp": sent_at,
+    }
+    return Message(raw, None)
+
+
+def test_lost_response_is_found_in_history():
+    client = _Client(lost=1)
+    outbox = Outbox(client)
+    key = outbox.queue(match_id, "Hi")
+    outbox.send()
+    assert client.sends == 1
+    assert outbox.get(key).message_id == "sent1"
+
+
+def test_message_of_the_match_user_is_not_taken_as_delivered():
+    # the request never reaches the API, but the other user writes the same text
+    reply = _message("reply", match_id, "Hi", int(time.time() * 1000) + 1000)
+    client = _Client([reply], dropped=1)
+    outbox = Outbox(client)
+    key = outbox.queue(match_id, "Hi")
+    outbox.send()
+    assert outbox.get(key).message_id == "sent1"
+
+
+def test_message_sent_before_the_first_attempt_is_not_taken_as_delivered():
+    now = int(time.time() * 1000)
+    earlier = _message("earlier", self_id, "Hi", now - 3600000)
+    client = _Client([earlier], dropped=1)
+    outbox = Outbox(client)
+    key = outbox.queue(match_id, "Hi")
+    # queued a long time ago, the first attempt happens now
+    outbox.get(key).queued_at = now - 7200000
+    outbox.send()
+    assert outbox.get(key).message_id == "sent1"
+
+
+def test_message_claimed_by_another_entry_is_skipped():
+    client = _Client()
+    outbox = Outbox(client)
+    first = outbox.queue(match_id, "Hi")
+    outbox.send()
+    client.dropped = 1
+    second = outbox.queue(match_id, "Hi")
+    outbox.send()
+    assert outbox.get(first).message_id == "sent1"
+    assert outbox.get(second).message_id == "sent2"
+    assert client.sends == 2
+
+
+def test_first_attempt_is_journaled(tmp_path):
+    journal = str(tmp_path / "outbox.ndjson")
+    client = _Client(dropped=1)
+    outbox = Outbox(client, journal, retries=0)
+    key = outbox.queue(match_id, "Hi")
+    outbox.send()
+    attempted_at = outbox.get(key).attempted_at
+    assert attempted_at is not None
+    resumed = Outbox(client, journal)
+    assert resumed.get(key).attempted_at == attempted_at
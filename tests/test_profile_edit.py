@@ -0,0 +1,53 @@
+import time
+
+from tinder.benchmarks import fixtures
+from tinder.entities.user import SelfUser
+
+
+class _Http:
+    def __init__(self):
+        self.requests = []
+
+    def make_request(self, **kwargs):
+        self.requests.append((kwargs["method"], kwargs["route"], kwargs.get("body")))
+
+
+def _self_user() -> SelfUser:
+    return SelfUser(fixtures.self_user(), _Http())
+
+
+def test_immediate_update_sends_pending_debounced_edit_first():
+    user = _self_user()
+    with user.edit(debounce=0.3) as tx:
+        tx.bio("A").search_preferences(distance_filter=20)
+    user.update_bio("B")
+    time.sleep(0.4)
+    assert user.http.requests == [
+        ("POST", "/v2/profile", {"user": {"bio": "B", "distance_filter": 20}})
+    ]
+    assert user.bio == "B"
+    assert user.distance_filter == 20
+
+
+def test_immediate_block_wins_over_debounced_block():
+    user = _self_user()
+    with user.edit(debounce=0.3) as tx:
+        tx.school("A")
+    with user.edit() as tx:
+        tx.school("B")
+    time.sleep(0.4)
+    assert [body for _, _, body in user.http.requests] == [
+        {"schools": {"displayed": True, "name": "B"}}
+    ]
+    assert user.school == "B"
+
+
+def test_debounced_blocks_are_merged():
+    user = _self_user()
+    with user.edit(debounce=0.1) as tx:
+        tx.bio("A")
+    with user.edit(debounce=0.1) as tx:
+        tx.bio("B")
+    assert user.http.requests == []
+    user.flush_edits()
+    assert user.http.requests == [("POST", "/v2/profile", {"user": {"bio": "B"}})]
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from tinder.streaming import JsonArrayStream
+
+document = {
+    "data": {
+        "matches": [
+            {"_id": "a", "distance": 1.5, "score": 3e2, "ratio": -0.25e-3, "count": 12},
+            1.5,
+            3e2,
+            -12,
+            0,
+            1e-7,
+            True,
+            None,
+            "text",
+        ],
+        "next_page_token": 2.75,
+    }
+}
+
+
+def _split(payload: bytes, offset: int):
+    yield payload[:offset]
+    yield payload[offset:]
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+def test_items_split_at_every_offset(separators):
+    payload = json.dumps(document, separators=separators).encode()
+    expected = document["data"]["matches"]
+    for offset in range(len(payload) + 1):
+        items = JsonArrayStream(_split(payload, offset), ("data", "matches"))
+        assert list(items) == expected, offset
+        assert items.siblings == {"next_page_token": 2.75}, offset
+
+
+def test_numbers_split_across_chunks():
+    items = JsonArrayStream([b'{"results":[1.', b"5]}"], ("results",))
+    assert list(items) == [1.5]
+    items = JsonArrayStream([b'{"results":[3e', b"2]}"], ("results",))
+    assert list(items) == [300.0]
+
+
+def test_numbers_split_into_single_bytes():
+    payload = json.dumps(document).encode()
+    items = JsonArrayStream((payload[i : i + 1] for i in range(len(payload))), ("data", "matches"))
+    assert list(items) == document["data"]["matches"]
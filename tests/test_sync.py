@@ -0,0 +1,60 @@
+import json
+import os
+
+from tinder.benchmarks import fixtures
+from tinder.entities.message import Message
+from tinder.export import message_fields, open_writer
+from tinder.sync import Mirror
+
+
+def _write(path: str, content: str):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def test_interrupted_publish_is_finished_once(tmp_path):
+    directory = str(tmp_path)
+    # the previous sync saved its state, then stopped halfway through appending the parts
+    _write(os.path.join(directory, "matches.ndjson"), "a\nb\n")
+    _write(os.path.join(directory, "matches.ndjson.part"), "b\nc\n")
+    _write(os.path.join(directory, "messages.ndjson"), "x\n")
+    _write(os.path.join(directory, "messages.ndjson.part"), "y\n")
+    state = {
+        "cursor": "2024-01-01T00:00:00.000Z",
+        "last_message": {},
+        "publishing": {"matches.ndjson": 2, "messages.ndjson": 2},
+    }
+    _write(os.path.join(directory, "state.json"), json.dumps(state))
+
+    Mirror(None, directory)
+
+    assert _read(os.path.join(directory, "matches.ndjson")) == "a\nb\nc\n"
+    assert _read(os.path.join(directory, "messages.ndjson")) == "x\ny\n"
+    assert sorted(os.listdir(directory)) == ["matches.ndjson", "messages.ndjson", "state.json"]
+    assert "publishing" not in json.loads(_read(os.path.join(directory, "state.json")))
+    Mirror(None, directory)
+    assert _read(os.path.join(directory, "matches.ndjson")) == "a\nb\nc\n"
+
+
+def test_dates_are_compared_in_milliseconds(tmp_path):
+    directory = str(tmp_path)
+    state = {"cursor": "x", "last_message": {"m": "2024-01-01T00:01:00.000Z"}}
+    _write(os.path.join(directory, "state.json"), json.dumps(state))
+    mirror = Mirror(None, directory)
+    assert mirror.last_message == {"m": 1704067260000}
+
+    older = fixtures.message("m", 0)
+    # dates given as integer milliseconds are read from `timestamp`
+    older["sent_date"] = older["timestamp"] = 1704067200000
+    newer = fixtures.message("m", 1)
+    newer["sent_date"] = newer["timestamp"] = 1704067320000
+    path = os.path.join(directory, "messages.ndjson")
+    with open_writer(path, message_fields, "ndjson") as writer:
+        mirror._write_messages("m", [Message(newer, None), Message(older, None)], writer)
+    assert writer.written == 1
+    assert mirror.last_message == {"m": 1704067320000}
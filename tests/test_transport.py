@@ -0,0 +1,15 @@
+import logging
+
+from tinder.http import Http
+from tinder.transport import FakeTransport
+
+
+def test_fake_transport_skips_the_rate_limit():
+    transport = FakeTransport()
+    transport.add("GET", "/profile", {"ok": True})
+    http = Http("token", logging.CRITICAL, transport=transport)
+    waits = []
+    http._wait = waits.append
+    assert http.make_request(method="GET", route="/profile").json() == {"ok": True}
+    assert waits == []
+    assert len(transport.requests) == 1
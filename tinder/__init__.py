@@ -1 +1,47 @@
-from .tinder import *
+import importlib
+
+_exports = {
+    "TinderClient": "tinder.tinder",
+    "SwipePipeline": "tinder.pipeline",
+    "MessagePrefetcher": "tinder.prefetch",
+    "Outbox": "tinder.outbox",
+    "Paginator": "tinder.pagination",
+    "Decision": "tinder.pipeline",
+    "SeenFilter": "tinder.seen",
+    "MessageIndex": "tinder.search",
+    "ActivityIndex": "tinder.activity",
+    "Deadline": "tinder.deadline",
+    "RateControllers": "tinder.ratelimit",
+    "CancellationToken": "tinder.deadline",
+    "Http": "tinder.http",
+    "Transport": "tinder.transport",
+    "RequestsTransport": "tinder.transport",
+    "Urllib3Transport": "tinder.transport",
+    "Http2Transport": "tinder.transport",
+    "FakeTransport": "tinder.transport",
+    "RecordingTransport": "tinder.cassette",
+    "ReplayTransport": "tinder.cassette",
+    "Update": "tinder.entities.update",
+    "Match": "tinder.entities.match",
+    "UserProfile": "tinder.entities.user",
+    "LikePreview": "tinder.entities.user",
+    "Recommendation": "tinder.entities.user",
+    "SelfUser": "tinder.entities.user",
+    "LikedUser": "tinder.entities.user",
+    "Unauthorized": "tinder.exceptions",
+    "LoginException": "tinder.exceptions",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name in _exports:
+        value = getattr(importlib.import_module(_exports[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,117 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple, Union
+
+from tinder.entities.dates import to_millis
+
+
+def _millis(value: Union[str, int, datetime]) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return to_millis(value)
+
+
+class ActivityIndex:
+    """
+    The last activity of each match as milliseconds since the epoch, kept sorted, so the most
+    recent conversations are found without building or sorting `Match` objects. Dates are
+    parsed once when a match is added or updated.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[int, str]] = []
+        self._dates: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def update(self, match_id: str, last_activity: Union[str, int, datetime]) -> bool:
+        """
+        Sets the last activity of a match. Older dates than the known one are ignored.
+
+        :param match_id: the match id
+        :param last_activity: the date as ISO 8601 string, milliseconds or datetime
+        :return: `true` if the index changed
+        """
+
+        date = _millis(last_activity)
+        with self._lock:
+            known = self._dates.get(match_id)
+            if known is not None:
+                if date <= known:
+                    return False
+                del self._entries[bisect_left(self._entries, (known, match_id))]
+            self._dates[match_id] = date
+            insort(self._entries, (date, match_id))
+            return True
+
+    def add_raw(self, match: dict) -> bool:
+        """
+        Adds a match from its raw dict, e.g. of a `/v2/matches` page or an `/updates` response.
+        The date of the newest message counts as activity as well.
+
+        :param match: the raw match
+        :return: `true` if the index changed
+        """
+
+        dates = [to_millis(match.get("last_activity_date"))]
+        dates.extend(to_millis(message.get("sent_date")) for message in match.get("messages", ()))
+        return self.update(match["_id"], max(dates))
+
+    def add_all(self, matches: Iterable[dict]) -> int:
+        """
+        Adds several raw matches.
+
+        :param matches: the raw matches
+        :return: the amount of added or changed matches
+        """
+
+        return sum(self.add_raw(match) for match in matches)
+
+    def remove(self, match_id: str):
+        with self._lock:
+            date = self._dates.pop(match_id, None)
+            if date is not None:
+                del self._entries[bisect_left(self._entries, (date, match_id))]
+
+    def top_k(self, k: int) -> List[str]:
+        """
+        Gets the most recently active matches.
+
+        :param k: the amount of matches
+        :return: the match ids from recent to past
+        """
+
+        with self._lock:
+            return [match_id for _, match_id in self._entries[: -k - 1 : -1]] if k > 0 else []
+
+    def active_since(self, since: Union[str, int, datetime]) -> List[str]:
+        """
+        Gets the matches with activity at or after a date.
+
+        :param since: the date as ISO 8601 string, milliseconds or datetime
+        :return: the match ids from recent to past
+        """
+
+        date = _millis(since)
+        with self._lock:
+            start = bisect_left(self._entries, (date, ""))
+            return [match_id for _, match_id in reversed(self._entries[start:])]
+
+    def last_activity(self, match_id: str) -> int:
+        """
+        Gets the last activity of a match.
+
+        :param match_id: the match id
+        :return: the milliseconds since the epoch, 0 if the match is unknown
+        """
+
+        return self._dates.get(match_id, 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, match_id: str):
+        return match_id in self._dates
+
+    def __str__(self):
+        return f"ActivityIndex({len(self._entries)} matches)"
@@ -0,0 +1,7 @@
+"""
+Benchmarks for tinder.py. Each module can be run on its own, e.g.
+
+    python -m tinder.benchmarks.interning
+
+and exposes a `run` function returning its results as a dict.
+"""
@@ -0,0 +1,62 @@
+import argparse
+import time
+
+from tinder.activity import ActivityIndex
+from tinder.benchmarks import fixtures
+from tinder.entities.dates import to_millis
+from tinder.entities.match import Match
+
+
+def run(count: int = 20000, k: int = 20, updates: int = 1000) -> dict:
+    """
+    Compares finding the `k` most recent of `count` matches by building and sorting all
+    `Match` objects against an `ActivityIndex` filled from the raw pages.
+
+    :param count: the amount of matches
+    :param k: the amount of recent matches
+    :param updates: the amount of incremental updates to time
+    :return: the milliseconds of both approaches
+    """
+
+    raws = [fixtures.match(i) for i in range(count)]
+
+    start = time.perf_counter()
+    matches = [Match(raw, None, None) for raw in raws]
+    recent = sorted(matches, key=lambda match: match.last_activity_date, reverse=True)[:k]
+    sort_ms = (time.perf_counter() - start) * 1000
+
+    index = ActivityIndex()
+    start = time.perf_counter()
+    index.add_all(raws)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    top = index.top_k(k)
+    top_k_ms = (time.perf_counter() - start) * 1000
+    # ties may be ordered differently, the dates must agree
+    expected = [to_millis(match.last_activity_date) for match in recent]
+    assert [index.last_activity(match_id) for match_id in top] == expected
+
+    start = time.perf_counter()
+    for i in range(updates):
+        index.update(raws[i * 7 % count]["_id"], 1800000000000 + i)
+    update_us = (time.perf_counter() - start) / updates * 1e6
+
+    return {
+        "build_and_sort_ms": round(sort_ms, 2),
+        "index_build_ms": round(build_ms, 2),
+        "top_k_ms": round(top_k_ms, 4),
+        "update_us": round(update_us, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recent matches with and without the index")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+    for name, value in run(args.count, args.k).items():
+        print(f"{name:<20} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import logging
+import time
+
+from tinder.benchmarks.stub import StubServer
+from tinder.ratelimit import RateControllers
+from tinder.tinder import TinderClient
+
+
+def _timed(results: dict, name: str, operation):
+    start = time.perf_counter()
+    count = operation()
+    results[name] = {"seconds": round(time.perf_counter() - start, 4), "items": count}
+
+
+def run(
+    matches: int = 300,
+    messages: int = 20,
+    latency: float = 0.0,
+    ratelimit: int = 0,
+    adaptive: bool = False,
+) -> dict:
+    """
+    Runs the main client operations against a local `StubServer`.
+
+    :param matches: the amount of matches of the stub account
+    :param messages: the amount of messages per match
+    :param latency: the emulated network latency in seconds
+    :param ratelimit: the ratelimit multiplicator of the client, default 0 for no waits
+    :param adaptive: use `RateControllers` instead of the fixed ratelimit
+    :return: the seconds and items per operation and the request metrics
+    """
+
+    results = {}
+    with StubServer(matches, messages, latency=latency) as server:
+        client = TinderClient(
+            "benchmark-token",
+            logging.ERROR,
+            ratelimit,
+            base_url=server.url,
+            rate_controllers=RateControllers(rate=1000.0, max_rate=10000.0) if adaptive else None,
+        )
+        _timed(results, "load_all_matches", lambda: len(client.load_all_matches()))
+        _timed(results, "iter_matches", lambda: sum(1 for _ in client.iter_matches()))
+        _timed(
+            results,
+            "get_recommendations x10",
+            lambda: sum(len(client.get_recommendations()) for _ in range(10)),
+        )
+        _timed(
+            results,
+            "prefetch_messages",
+            lambda: sum(
+                len(match.message_history.get_messages())
+                for match in client.prefetch_messages(client.iter_matches())
+            ),
+        )
+        _timed(results, "get_liked_users", lambda: len(client.get_liked_users()))
+        results["requests"] = server.requests
+    results["metrics"] = client.metrics
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End to end benchmark against a local stub")
+    parser.add_argument("--matches", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--metrics", action="store_true", help="print the request metrics")
+    args = parser.parse_args()
+    result = run(args.matches, args.messages, args.latency)
+    metrics = result.pop("metrics")
+    print(f"requests: {result.pop('requests')}")
+    for name, timing in result.items():
+        print(f"  {name:<24} {timing['seconds']:8.3f} s  {timing['items']:>6} items")
+    if args.metrics:
+        print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Synthetic, real-shaped API payloads for the benchmarks.
+
+All payloads are deterministic for a given index. Sub-entities such as interests, descriptors,
+badges and Spotify artists are drawn from small shared vocabularies, like on real accounts.
+"""
+
+from random import Random
+
+_interests = [
+    {"id": f"it_{i}", "name": name}
+    for i, name in enumerate(
+        [
+            "Reading",
+            "Road Trips",
+            "Hiking",
+            "Coffee",
+            "Travel",
+            "Cooking",
+            "Yoga",
+            "Photography",
+            "Music",
+            "Gym",
+            "Movies",
+            "Wine",
+            "Dogs",
+            "Cats",
+            "Gaming",
+            "Art",
+            "Running",
+            "Dancing",
+            "Festivals",
+            "Sushi",
+        ]
+    )
+]
+
+_descriptors = [
+    {
+        "id": f"de_{i}",
+        "name": name,
+        "prompt": f"What about {name.lower()}?",
+        "icon_url": f"https://static.gotinder.com/icons/descriptors/{name.lower()}@3x.png",
+        "icon_urls": [
+            {
+                "url": f"https://static.gotinder.com/icons/descriptors/{name.lower()}@3x.png",
+                "quality": "3x",
+                "width": 48,
+                "height": 48,
+            }
+        ],
+        "choices": [{"id": f"{i}_{c}", "name": f"{name} option {c}"} for c in range(4)],
+    }
+    for i, name in enumerate(["Zodiac", "Education", "Pets", "Drinking", "Smoking", "Workout"])
+]
+
+_badges = [{"type": "selfie_verified"}, {"type": "id_verified"}]
+
+_countries = [
+    {"country": {"name": "Germany", "cc": "DE", "alpha3": "DEU"}, "timezone": "Europe/Berlin"},
+    {"country": {"name": "France", "cc": "FR", "alpha3": "FRA"}, "timezone": "Europe/Paris"},
+    {"country": {"name": "Spain", "cc": "ES", "alpha3": "ESP"}, "timezone": "Europe/Madrid"},
+]
+
+self_id = f"{0:024x}"
+"""The id of the self user, see `self_user`"""
+
+
+def _artist(i: int) -> dict:
+    return {"id": f"artist{i:04d}", "name": f"Artist {i}"}
+
+
+def _album(i: int) -> dict:
+    return {
+        "id": f"album{i:04d}",
+        "name": f"Album {i}",
+        "images": [
+            {"height": size, "width": size, "url": f"https://i.scdn.co/image/album{i:04d}_{size}"}
+            for size in (640, 300, 64)
+        ],
+    }
+
+
+def _track(i: int) -> dict:
+    return {
+        "id": f"track{i:05d}",
+        "name": f"Track {i}",
+        "album": _album(i % 150),
+        "artists": [_artist(i % 200)],
+        "preview_url": f"https://p.scdn.co/mp3-preview/track{i:05d}",
+        "uri": f"spotify:track:track{i:05d}",
+    }
+
+
+def _photo(user_id: str, index: int, rng: Random) -> dict:
+    photo_id = f"{user_id}-p{index}"
+    return {
+        "id": photo_id,
+        "crop_info": {
+            "processed_by_bullseye": True,
+            "user_customized": False,
+            "user": {"width_pct": 1, "x_offset_pct": 0, "height_pct": 0.8, "y_offset_pct": 0.1},
+            "algo": {"width_pct": 0.4, "x_offset_pct": 0.3, "height_pct": 0.4, "y_offset_pct": 0.1},
+            "faces": [
+                {
+                    "algo": {
+                        "width_pct": 0.4,
+                        "x_offset_pct": 0.3,
+                        "height_pct": 0.4,
+                        "y_offset_pct": 0.1,
+                    },
+                    "bounding_box_percentage": 16.0,
+                }
+            ],
+        },
+        "url": f"https://images-ssl.gotinder.com/{user_id}/original_{photo_id}.jpeg",
+        "processedFiles": [
+            {
+                "url": f"https://images-ssl.gotinder.com/{user_id}/{size}x{size}_{photo_id}.jpg",
+                "height": size,
+                "width": size,
+            }
+            for size in (640, 320, 172, 84)
+        ],
+        "fileName": f"{photo_id}.jpg",
+        "extension": "jpg,webp",
+        "type": "image",
+        "media_type": "image",
+        "webp_qf": [75],
+        "rank": index,
+        "score": rng.random(),
+        "win_count": rng.randint(0, 50),
+        "assets": [
+            {
+                "url": f"https://images-ssl.gotinder.com/{user_id}/640x800_{photo_id}.webp",
+                "height": 800,
+                "width": 640,
+                "created_at": "2023-05-04T12:30:00+00:00",
+            }
+        ],
+    }
+
+
+def _user(i: int, rng: Random) -> dict:
+    user_id = f"{i:024x}"
+    return {
+        "_id": user_id,
+        "bio": f"Bio of user {i}. " * rng.randint(1, 8),
+        "birth_date": f"{1985 + i % 15}-0{1 + i % 9}-1{i % 10}T00:00:00+00:00",
+        "name": f"User{i}",
+        "gender": i % 2,
+        "badges": rng.sample(_badges, rng.randint(0, 2)),
+        "photos": [_photo(user_id, p, rng) for p in range(rng.randint(2, 6))],
+        "ping_time": "2024-01-01T12:00:00.000Z",
+    }
+
+
+def recommendation(i: int) -> dict:
+    """
+    Gets a raw `/recs/core` result.
+    """
+
+    rng = Random(i)
+    user = _user(i, rng)
+    user.update(
+        {
+            "jobs": [],
+            "schools": [{"name": f"University {i % 40}"}] if i % 3 else [],
+            "city": {"name": f"City {i % 25}"},
+            "distance_mi": rng.randint(1, 50),
+            "s_number": rng.randint(10**9, 10**10),
+            "teasers": [{"type": "school", "string": f"University {i % 40}"}],
+            "user_interests": {"selected_interests": rng.sample(_interests, 5)},
+            "show_gender_on_profile": True,
+            "spotify_top_artists": [
+                dict(_artist(a), selected=True, top_track=_track(a))
+                for a in rng.sample(range(200), 3)
+            ],
+            "spotify_theme_track": _track(rng.randint(0, 500)),
+            "group_matched": False,
+            "content_hash": f"hash{i:08x}",
+        }
+    )
+    user["selected_descriptors"] = []
+    for descriptor in rng.sample(_descriptors, 3):
+        descriptor = dict(descriptor)
+        descriptor["choice_selection"] = rng.choice(descriptor.pop("choices"))
+        user["selected_descriptors"].append(descriptor)
+    return user
+
+
+def user_profile(i: int) -> dict:
+    """
+    Gets the `results` of a raw `/user/{id}` response.
+    """
+
+    user = recommendation(i)
+    user.update({"birth_date_info": "fuzzy birthdate active", "is_tinder_u": False})
+    return user
+
+
+def liked_user(i: int) -> dict:
+    """
+    Gets a raw `/v2/my-likes` result.
+    """
+
+    user = recommendation(i)
+    return {
+        "type": "user",
+        "user": user,
+        "content_hash": user.pop("content_hash"),
+        "distance_mi": user.pop("distance_mi"),
+        "s_number": user.pop("s_number"),
+        "teasers": user.pop("teasers"),
+        "has_been_superliked": False,
+        "expire_time": 1893456000000,
+    }
+
+
+def message(match_id: str, i: int) -> dict:
+    """
+    Gets a raw message of a match.
+    """
+
+    return {
+        "_id": f"{match_id}m{i:06d}",
+        "match_id": match_id,
+        "sent_date": f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00.000Z",
+        "message": f"Message number {i} in this conversation, how are you?",
+        "from": match_id[:24],
+        "to": match_id[24:],
+        "timestamp": 1704067200000 + i * 60000,
+    }
+
+
+def match(i: int, messages: int = 0) -> dict:
+    """
+    Gets a raw `/v2/matches` entry.
+    """
+
+    rng = Random(i)
+    person = _user(i, rng)
+    match_id = f"{i:024x}{'f' * 24}"
+    return {
+        "_id": match_id,
+        "id": match_id,
+        "closed": False,
+        "common_friend_count": 0,
+        "common_like_count": 0,
+        "created_date": "2023-12-01T10:00:00.000Z",
+        "dead": False,
+        "last_activity_date": f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00.000Z",
+        "message_count": messages,
+        "messages": [message(match_id, m) for m in range(messages)],
+        "seen": {"match_seen": True, "last_seen_message_id": ""},
+        "pending": False,
+        "is_super_like": False,
+        "is_boost_match": False,
+        "is_super_boost_match": False,
+        "is_experiences_match": False,
+        "is_fast_match": False,
+        "is_opener": bool(i % 2),
+        "person": person,
+        "following": True,
+        "following_moments": True,
+        "readreceipt": {"enabled": False},
+    }
+
+
+def update(i: int, matches: int = 10, messages: int = 3) -> dict:
+    """
+    Gets a raw `/updates` response. Every fourth match is new and not seen yet.
+    """
+
+    entries = []
+    for m in range(matches):
+        entry = match(i * matches + m, messages)
+        entry["seen"]["match_seen"] = m % 4 != 0
+        entries.append(entry)
+    return {
+        "matches": entries,
+        "blocks": [],
+        "lists": [],
+        "deleted_lists": [],
+        "liked_messages": [],
+        "squads": [],
+        "last_activity_date": f"2024-02-{1 + i % 28:02d}T12:00:00.000Z",
+    }
+
+
+def self_user() -> dict:
+    """
+    Gets a raw `/profile` response.
+    """
+
+    rng = Random(0)
+    user = _user(0, rng)
+    for photo_dict in user["photos"]:
+        photo_dict.update(
+            {
+                "assets": [],
+                "created_at": "2023-05-04T12:30:00.000Z",
+                "updated_at": "2023-05-04T12:30:00.000Z",
+                "phash": {"version": "1", "value": "abc"},
+                "dhash": {"version": "1", "value": "def"},
+            }
+        )
+    user.update(
+        {
+            "age_filter_min": 18,
+            "age_filter_max": 35,
+            "create_date": "2020-01-01T00:00:00.000Z",
+            "distance_filter": 50,
+            "gender_filter": 1,
+            "email": "self@example.com",
+            "interested_in": [1],
+            "photo_optimizer_enabled": False,
+            "pos": {"at": 1704067200000, "lat": 52.52, "lon": 13.40},
+            "pos_info": _countries[0],
+            "show_gender_on_profile": True,
+            "can_create_squad": False,
+        }
+    )
+    return user
+
+
+def position_info(i: int) -> dict:
+    """
+    Gets a raw `pos_info` entry.
+    """
+
+    return _countries[i % len(_countries)]
@@ -0,0 +1,66 @@
+import argparse
+import subprocess
+import sys
+
+
+def _import_time(statement: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; import sys; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # only top level package imports, their cumulative time includes nested imports
+        if name.startswith(" ") and not name.startswith("  ") and name.strip().startswith("tinder"):
+            total += int(cumulative)
+    return {"microseconds": total, "modules": set(result.stdout.split())}
+
+
+def run(budget_ms: float = 10.0) -> dict:
+    """
+    Measures the cost of `import tinder` and `from tinder import TinderClient` in fresh
+    interpreters and asserts that both stay within `budget_ms` and do not load `requests` or the
+    entity modules.
+
+    :param budget_ms: the import time budget in milliseconds
+    :return: the import times of the package and the client
+    """
+
+    package = _import_time("import tinder")
+    client = _import_time("from tinder import TinderClient")
+    result = {
+        "package_ms": package["microseconds"] / 1000,
+        "client_ms": client["microseconds"] / 1000,
+        "budget_ms": budget_ms,
+    }
+    for statement, measured, key in (
+        ("import tinder", package, "package_ms"),
+        ("from tinder import TinderClient", client, "client_ms"),
+    ):
+        eager = {"requests", "tinder.http", "tinder.entities.user"} & measured["modules"]
+        assert not eager, f"{statement} eagerly loads {', '.join(sorted(eager))}"
+        assert (
+            result[key] <= budget_ms
+        ), f"{statement} took {result[key]:.1f} ms, the budget is {budget_ms} ms"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time benchmark of the package")
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    result = run(args.budget_ms)
+    print(f"import tinder:                   {result['package_ms']:.1f} ms")
+    print(f"from tinder import TinderClient: {result['client_ms']:.1f} ms")
+    print(f"budget:                          {result['budget_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
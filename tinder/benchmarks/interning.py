@@ -0,0 +1,65 @@
+import argparse
+import gc
+import json
+import tracemalloc
+
+from tinder.benchmarks import fixtures
+from tinder.entities.intern import InternPool, interning
+from tinder.entities.user import Recommendation
+
+
+def _retained(pages) -> int:
+    gc.collect()
+    tracemalloc.start()
+    entities = []
+    for page in pages:
+        entities.extend(Recommendation(r, None) for r in json.loads(page)["results"])
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return size
+
+
+def run(count: int = 20000, page_size: int = 50) -> dict:
+    """
+    Builds `count` recommendations from JSON pages with and without interning and compares the
+    memory retained by the entities after the raw payloads were released.
+
+    :param count: the amount of recommendations
+    :param page_size: the amount of recommendations per page
+    :return: the retained bytes of both runs and the reduction
+    """
+
+    pages = [
+        json.dumps({"results": [fixtures.recommendation(i) for i in range(s, s + page_size)]})
+        for s in range(0, count, page_size)
+    ]
+    plain = _retained(pages)
+    pool = InternPool()
+    with interning(pool):
+        interned = _retained(pages)
+    return {
+        "count": count,
+        "plain_bytes": plain,
+        "interned_bytes": interned,
+        "reduction": 1 - interned / plain,
+        "pooled_entities": len(pool),
+        "hit_rate": pool.hit_rate(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory benchmark of the intern pool")
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+    result = run(args.count)
+    print(f"recommendations:  {result['count']}")
+    print(f"without interning: {result['plain_bytes'] / 2 ** 20:.1f} MiB")
+    print(f"with interning:    {result['interned_bytes'] / 2 ** 20:.1f} MiB")
+    print(f"reduction:         {result['reduction']:.1%}")
+    print(f"pooled entities:   {result['pooled_entities']} ({result['hit_rate']:.1%} hits)")
+
+
+if __name__ == "__main__":
+    main()
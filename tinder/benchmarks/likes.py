@@ -0,0 +1,71 @@
+import argparse
+import logging
+import time
+import tracemalloc
+
+from tinder.benchmarks import fixtures
+from tinder.benchmarks.stub import StubServer
+from tinder.entities.user import LikedUser
+from tinder.tinder import TinderClient
+
+
+def _flattened(like: dict) -> dict:
+    # the copy of every result that LikedUser used to make
+    return {**like, **like["user"]}
+
+
+def _peak(operation) -> int:
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(count: int = 5000, page_size: int = 100) -> dict:
+    """
+    Builds `count` liked users from flattened copies and from the raw results, then loads them
+    from a local `StubServer` as tuple and as stream.
+
+    :param count: the amount of liked users
+    :param page_size: the amount of liked users per page
+    :return: the build and load timings and the peak memory of both ways to load
+    """
+
+    likes = [fixtures.liked_user(i) for i in range(count)]
+    start = time.perf_counter()
+    for like in likes:
+        LikedUser(_flattened(like), None)
+    copied = time.perf_counter() - start
+    start = time.perf_counter()
+    for like in likes:
+        LikedUser(like, None)
+    direct = time.perf_counter() - start
+    results = {"build_copied_ms": round(copied * 1000, 1), "build_ms": round(direct * 1000, 1)}
+
+    with StubServer(likes=count, page_size=page_size) as server:
+        client = TinderClient(
+            "benchmark-token", logging.ERROR, 0, entity_cache_size=0, base_url=server.url
+        )
+        start = time.perf_counter()
+        next(client.iter_liked_users())
+        results["first_user_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        start = time.perf_counter()
+        results["users"] = len(client.get_liked_users())
+        results["load_all_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        results["get_peak_kib"] = _peak(client.get_liked_users) // 1024
+        results["iter_peak_kib"] = _peak(lambda: sum(1 for _ in client.iter_liked_users())) // 1024
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paginated liked users")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    for name, value in run(args.count, args.page_size).items():
+        print(f"{name:<16} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections import defaultdict
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import Callable, Dict
+
+from tinder.benchmarks import fixtures
+from tinder.entities.match import Match, MessageHistory
+from tinder.entities.message import Message
+from tinder.entities.photo import GenericPhoto, MatchPhoto
+from tinder.entities.serialization import slot_names, unbound
+from tinder.entities.socials import SpotifyTopArtist, SpotifyTrack
+from tinder.entities.update import Update
+from tinder.entities.user import (
+    LikedUser,
+    LikePreview,
+    MatchedUser,
+    Recommendation,
+    SelfUser,
+    UserProfile,
+)
+
+
+def _loads(raw: dict) -> dict:
+    # decoded inside the traced block, like a payload received from the API
+    return json.loads(json.dumps(raw))
+
+
+def _history(i: int) -> MessageHistory:
+    match_id = fixtures.match(i)["_id"]
+    history = MessageHistory(None, match_id)
+    for m in range(60):
+        history.add_message(Message(_loads(fixtures.message(match_id, m)), None))
+    return history
+
+
+def _liked_user(i: int) -> LikedUser:
+    return LikedUser(fixtures.liked_user(i), None)
+
+
+subjects: Dict[str, Callable[[int], object]] = {
+    "Match": lambda i: Match(_loads(fixtures.match(i)), None, None),
+    "MessageHistory(60)": _history,
+    "Message": lambda i: Message(_loads(fixtures.message(fixtures.match(i)["_id"], i)), None),
+    "Recommendation": lambda i: Recommendation(_loads(fixtures.recommendation(i)), None),
+    "UserProfile": lambda i: UserProfile(_loads(fixtures.user_profile(i)), None),
+    "LikedUser": _liked_user,
+    "LikePreview": lambda i: LikePreview(_loads(fixtures.recommendation(i)), None),
+    "MatchedUser": lambda i: MatchedUser(_loads(fixtures.match(i)["person"]), None),
+    "SelfUser": lambda i: SelfUser(_loads(fixtures.self_user()), None),
+    "GenericPhoto": lambda i: GenericPhoto(_loads(fixtures.recommendation(i)["photos"][0]), None),
+    "MatchPhoto": lambda i: MatchPhoto(_loads(fixtures.self_user()["photos"][0]), None),
+    "SpotifyTrack": lambda i: SpotifyTrack(
+        _loads(fixtures.recommendation(i)["spotify_theme_track"])
+    ),
+    "SpotifyTopArtist": lambda i: SpotifyTopArtist(
+        _loads(fixtures.recommendation(i)["spotify_top_artists"][0])
+    ),
+    "Update": lambda i: Update(_loads(fixtures.update(i))),
+    "Update(slim)": lambda i: Update(_loads(fixtures.update(i)), slim=True),
+}
+"""Builds one instance of each profiled class from the i-th fixture"""
+
+_skipped = (type, ModuleType, FunctionType)
+
+
+def _fields(value):
+    cls = type(value)
+    if hasattr(value, "__dict__") and not isinstance(value, _skipped):
+        yield from vars(value).items()
+    if hasattr(cls, "__slots__"):
+        for name in slot_names(cls):
+            if hasattr(value, name):
+                yield name, getattr(value, name)
+
+
+def deep_size(value, seen: set) -> int:
+    """
+    Gets the size of an object and everything it references that is not inside `seen` yet.
+    The `http` handles and clients entities are bound to are not counted.
+
+    :param value: the object
+    :param seen: the ids of the objects that were already counted, updated in place
+    :return: the size in bytes
+    """
+
+    if id(value) in seen or isinstance(value, (_skipped, Enum)) or value is None:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)) or type(value).__name__ == "deque":
+        size += sum(deep_size(item, seen) for item in value)
+    elif not isinstance(value, (str, bytes, int, float, bool)):
+        if hasattr(value, "__dict__"):
+            size += sys.getsizeof(vars(value))
+        for name, field in _fields(value):
+            if name not in unbound:
+                size += deep_size(field, seen)
+    return size
+
+
+def field_sizes(root) -> Dict[str, Dict[str, float]]:
+    """
+    Gets the average deep size per field of every entity class reachable from `root`. Sizes are
+    inclusive: the size of a field holding an entity contains the fields of that entity. Objects
+    referenced by several fields of one instance are attributed to the first field.
+
+    :param root: the entity to inspect
+    :return: the average size in bytes per field per class
+    """
+
+    totals: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    counts: Dict[str, int] = defaultdict(int)
+    pending = [root]
+    visited = set()
+    while pending:
+        value = pending.pop()
+        if id(value) in visited:
+            continue
+        visited.add(id(value))
+        if isinstance(value, (list, tuple)) or type(value).__name__ == "deque":
+            pending.extend(value)
+            continue
+        if not type(value).__module__.startswith("tinder.entities") or isinstance(value, Enum):
+            continue
+        name = type(value).__name__
+        counts[name] += 1
+        seen = {id(value)}
+        for field, item in _fields(value):
+            if field in unbound:
+                continue
+            totals[name][field] += deep_size(item, seen)
+            pending.append(item)
+    return {
+        name: {field: size / counts[name] for field, size in fields.items()}
+        for name, fields in totals.items()
+    }
+
+
+def retained(build: Callable[[int], object], count: int) -> int:
+    """
+    Measures the memory retained by `count` instances after their payloads were released.
+
+    :param build: builds the i-th instance
+    :param count: the amount of instances
+    :return: the retained bytes
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    instances = [build(i) for i in range(count)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+def run(
+    sample: int = 500, messages: int = 100000, matches: int = 50000, recommendations: int = 10000
+) -> dict:
+    """
+    Profiles the retained bytes per instance and the size per field of each entity class and
+    extrapolates the totals of a population from a sample.
+
+    :param sample: the amount of instances to measure per class
+    :param messages: the amount of messages of the population
+    :param matches: the amount of matches of the population
+    :param recommendations: the amount of recommendations of the population
+    :return: `classes` with the bytes per instance, `fields` per class and the `population`
+    """
+
+    classes = {name: retained(build, sample) / sample for name, build in subjects.items()}
+    fields: Dict[str, Dict[str, float]] = {}
+    for build in subjects.values():
+        for name, sizes in field_sizes(build(0)).items():
+            fields.setdefault(name, sizes)
+    population = {
+        "messages": messages * classes["Message"],
+        "matches": matches * classes["Match"],
+        "recommendations": recommendations * classes["Recommendation"],
+    }
+    population["total"] = sum(population.values())
+    return {"sample": sample, "classes": classes, "fields": fields, "population": population}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory profile of the entity classes")
+    parser.add_argument("--sample", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--matches", type=int, default=50000)
+    parser.add_argument("--recommendations", type=int, default=10000)
+    parser.add_argument("--fields", action="store_true", help="print the size per field")
+    parser.add_argument("--json", action="store_true", help="print the result as json")
+    args = parser.parse_args()
+    result = run(args.sample, args.messages, args.matches, args.recommendations)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"retained bytes per instance ({result['sample']} samples):")
+    for name, size in sorted(result["classes"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<20} {size:>12,.0f}")
+    if args.fields:
+        for name, sizes in sorted(result["fields"].items()):
+            print(f"{name}:")
+            for field, size in sorted(sizes.items(), key=lambda item: -item[1]):
+                print(f"  {field:<28} {size:>10,.0f}")
+    print("population:")
+    for name, size in result["population"].items():
+        print(f"  {name:<20} {size / 2 ** 20:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
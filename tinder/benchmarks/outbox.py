@@ -0,0 +1,60 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from tinder.benchmarks.stub import StubServer
+from tinder.outbox import Outbox
+from tinder.tinder import TinderClient
+
+
+def run(matches: int = 200, latency: float = 0.02, workers: int = 8, lost: float = 0.1) -> dict:
+    """
+    Sends one message to each of `matches` matches one by one and with an `Outbox`, whose
+    journal is written to a temporary file. A share of the responses is lost to check that
+    no message is sent twice.
+
+    :param matches: the amount of matches
+    :param latency: the emulated network latency in seconds
+    :param workers: the amount of matches the outbox sends to concurrently
+    :param lost: the share of sent messages answered with a server error
+    :return: the seconds of both ways and the delivery counts of the outbox
+    """
+
+    logging.getLogger("tinder-py").setLevel(logging.CRITICAL)
+    results = {}
+    with StubServer(matches, 1, latency=latency) as server:
+        client = TinderClient("benchmark-token", logging.CRITICAL, 0, base_url=server.url)
+        ids = [match.id for match in client.iter_matches(cache=False)]
+        start = time.perf_counter()
+        for match_id in ids:
+            client.send_message(match_id, "Hello World")
+        results["sequential_seconds"] = round(time.perf_counter() - start, 3)
+
+        server.lost_sends = lost
+        with tempfile.TemporaryDirectory() as directory:
+            outbox = Outbox(client, os.path.join(directory, "outbox.ndjson"), workers)
+            outbox.broadcast(ids, "Hello again")
+            start = time.perf_counter()
+            reports = outbox.send()
+            results["outbox_seconds"] = round(time.perf_counter() - start, 3)
+        results["delivered"] = sum(report.delivered for report in reports.values())
+        results["duplicates"] = sum(
+            [m["message"] for m in sent].count("Hello again") - 1 for sent in server.sent.values()
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential sends versus the outbox")
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    for name, value in run(args.matches, args.latency, args.workers).items():
+        print(f"{name:<20} {value}")
+
+
+if __name__ == "__main__":
+    main()
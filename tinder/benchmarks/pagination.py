@@ -0,0 +1,56 @@
+import argparse
+import logging
+import time
+
+from tinder.benchmarks.stub import StubServer
+from tinder.entities.message import Message
+from tinder.pagination import Paginator
+from tinder.tinder import TinderClient
+
+
+def run(messages: int = 1200, latency: float = 0.02, work: tuple = (0.0, 0.01, 0.03)) -> dict:
+    """
+    Iterates the message history of a match with and without requesting the next page in the
+    background. `work` emulates the time the consumer spends per page, e.g. writing to a
+    database, which overlaps with the next request when prefetching.
+
+    :param messages: the amount of messages, 60 per page
+    :param latency: the emulated network latency in seconds
+    :param work: the seconds of consumer work per page to compare
+    :return: the seconds per consumer work and mode
+    """
+
+    results = {}
+    with StubServer(matches=1, messages=messages, latency=latency) as server:
+        client = TinderClient("benchmark-token", logging.ERROR, 0, base_url=server.url)
+        history = client.load_all_matches()[0].message_history
+        for seconds in work:
+            timings = {}
+            for prefetch in (False, True):
+                pages = Paginator(history._fetch_page, prefetch=prefetch)
+                start = time.perf_counter()
+                for page in pages.pages():
+                    [Message(raw, client._http) for raw in page]
+                    time.sleep(seconds)
+                timings["prefetch" if prefetch else "sequential"] = round(
+                    time.perf_counter() - start, 4
+                )
+            timings["speedup"] = round(timings["sequential"] / timings["prefetch"], 2)
+            results[f"{seconds * 1000:.0f} ms work per page"] = timings
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipelined versus sequential page requests")
+    parser.add_argument("--messages", type=int, default=1200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    for name, timings in run(args.messages, args.latency).items():
+        print(
+            f"{name:<22} sequential {timings['sequential']:.3f} s  "
+            f"prefetch {timings['prefetch']:.3f} s  x{timings['speedup']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
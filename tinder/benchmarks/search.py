@@ -0,0 +1,85 @@
+import argparse
+import time
+from random import Random
+
+from tinder.benchmarks import fixtures
+from tinder.entities.message import Message
+from tinder.search import MessageIndex, tokenize
+
+_common = "hi hey how are you what up see tomorrow tonight dinner coffee drink sushi movie".split()
+
+
+def _messages(count: int, matches: int) -> list:
+    rng = Random(7)
+    vocabulary = _common + [f"w{i:04x}" for i in range(5000)]
+    messages = []
+    for i in range(count):
+        raw = fixtures.message(f"{i % matches:024x}{'f' * 24}", i)
+        raw["message"] = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 20)))
+        messages.append(Message(raw, None))
+    return messages
+
+
+def _scan(histories: dict, query: str) -> list:
+    # the linear search this index replaces, whole words only
+    words = tokenize(query)
+    return [
+        message
+        for history in histories.values()
+        for message in history
+        if all(word in tokenize(message.content) for word in words)
+    ]
+
+
+def run(count: int = 100000, matches: int = 2000, queries: int = 20) -> dict:
+    """
+    Compares searching `count` messages in `matches` conversations by scanning every history
+    against a `MessageIndex`.
+
+    :param count: the amount of messages
+    :param matches: the amount of conversations
+    :param queries: the amount of repetitions per query
+    :return: the build time and the milliseconds per query of both approaches
+    """
+
+    messages = _messages(count, matches)
+    histories = {}
+    for message in messages:
+        histories.setdefault(message.match_id, []).append(message)
+
+    index = MessageIndex()
+    start = time.perf_counter()
+    index.add_all(messages)
+    results = {
+        "build_seconds": round(time.perf_counter() - start, 3),
+        "words": len(index._postings),
+    }
+
+    for query in ("sushi", "dinner tomorrow", '"see you" tonight', "w00a*"):
+        start = time.perf_counter()
+        for _ in range(queries):
+            hits = index.search(query, limit=50)
+        indexed = (time.perf_counter() - start) / queries
+        timing = {"index_ms": round(indexed * 1000, 3), "hits": len(hits)}
+        if not query.endswith("*") and '"' not in query:
+            start = time.perf_counter()
+            _scan(histories, query)
+            timing["scan_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        results[query] = timing
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message search with and without the index")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--matches", type=int, default=2000)
+    args = parser.parse_args()
+    results = run(args.count, args.matches)
+    print(f"build: {results.pop('build_seconds')} s, {results.pop('words')} words")
+    for query, timing in results.items():
+        scan = f"  scan {timing['scan_ms']:8.1f} ms" if "scan_ms" in timing else ""
+        print(f"  {query:<20} index {timing['index_ms']:7.3f} ms{scan}  {timing['hits']} hits")
+
+
+if __name__ == "__main__":
+    main()
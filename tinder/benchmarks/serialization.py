@@ -0,0 +1,78 @@
+import argparse
+import json
+import pickle
+import time
+
+from tinder.benchmarks import fixtures
+from tinder.entities.entity import Entity
+from tinder.entities.match import Match
+from tinder.entities.user import UserProfile
+
+
+def _measure(encode, decode, values) -> dict:
+    start = time.perf_counter()
+    records = [encode(v) for v in values]
+    encoded = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in records:
+        decode(record)
+    decoded = time.perf_counter() - start
+    return {
+        "bytes": sum(len(r) for r in records),
+        "encode_seconds": encoded,
+        "decode_seconds": decoded,
+    }
+
+
+def run(count: int = 2000) -> dict:
+    """
+    Compares `to_bytes`/`from_bytes` against json and pickle on matches and user profiles.
+    The json figures include rebuilding the entity from the decoded dict.
+
+    :param count: the amount of entities per type
+    :return: size and timings per format and entity type
+    """
+
+    results = {}
+    cases = {
+        "Match": ([fixtures.match(i, 5) for i in range(count)], lambda r: Match(r, None, None)),
+        "UserProfile": (
+            [fixtures.user_profile(i) for i in range(count)],
+            lambda r: UserProfile(r, None),
+        ),
+    }
+    for name, (raws, build) in cases.items():
+        entities = [build(r) for r in raws]
+        results[name] = {
+            "to_bytes": _measure(
+                lambda e: e.to_bytes(), lambda d: Entity.from_bytes(d, None), entities
+            ),
+            "to_bytes+zlib": _measure(
+                lambda e: e.to_bytes(True), lambda d: Entity.from_bytes(d, None), entities
+            ),
+            "pickle": _measure(
+                lambda e: pickle.dumps(e, pickle.HIGHEST_PROTOCOL), pickle.loads, entities
+            ),
+            "json": _measure(
+                lambda r: json.dumps(r).encode(), lambda d: build(json.loads(d)), raws
+            ),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization benchmark of the entities")
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+    for name, formats in run(args.count).items():
+        print(f"{name} x {args.count}")
+        print(f"  {'format':<14}{'size KiB':>10}{'encode ms':>12}{'decode ms':>12}")
+        for fmt, result in formats.items():
+            print(
+                f"  {fmt:<14}{result['bytes'] / 1024:>10.0f}"
+                f"{result['encode_seconds'] * 1000:>12.1f}{result['decode_seconds'] * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
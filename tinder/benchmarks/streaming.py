@@ -0,0 +1,78 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+from tinder.benchmarks import fixtures
+from tinder.entities.match import Match
+from tinder.streaming import JsonArrayStream
+
+
+def _chunks(payload: bytes, size: int = 65536):
+    for start in range(0, len(payload), size):
+        yield payload[start : start + size]
+
+
+def _buffered(payload: bytes):
+    chunks = list(_chunks(payload))
+    for raw in json.loads(b"".join(chunks))["data"]["matches"]:
+        yield Match(raw, None, None)
+
+
+def _streamed(payload: bytes):
+    for raw in JsonArrayStream(_chunks(payload), ("data", "matches")):
+        yield Match(raw, None, None)
+
+
+def _measure(parse, payload: bytes) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in parse(payload):
+        # matches are consumed one by one, as by a sync job writing them out
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"count": count, "first_item": first, "total": total, "peak_bytes": peak}
+
+
+def run(count: int = 2000) -> dict:
+    """
+    Parses a `/v2/matches` response of `count` matches with and without streaming and compares
+    the time to the first match, the total time and the peak memory.
+
+    :param count: the amount of matches in the response
+    :return: the measurements of both runs
+    """
+
+    payload = json.dumps(
+        {"data": {"matches": [fixtures.match(i) for i in range(count)], "next_page_token": "x"}}
+    ).encode()
+    return {
+        "payload_bytes": len(payload),
+        "buffered": _measure(_buffered, payload),
+        "streamed": _measure(_streamed, payload),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming versus buffered parsing of matches")
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+    result = run(args.count)
+    print(f"payload: {result['payload_bytes'] / 2 ** 20:.1f} MiB")
+    for name in ("buffered", "streamed"):
+        run_result = result[name]
+        print(
+            f"{name:<9} first match {run_result['first_item'] * 1000:7.1f} ms  "
+            f"total {run_result['total'] * 1000:7.1f} ms  "
+            f"peak {run_result['peak_bytes'] / 2 ** 20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
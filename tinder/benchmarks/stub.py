@@ -0,0 +1,211 @@
+"""
+A local HTTP server answering the Tinder API routes with fixtures, to benchmark the client end
+to end without an account:
+
+>>> with StubServer(matches=500) as server:
+...     client = TinderClient("token", base_url=server.url)
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from tinder.benchmarks import fixtures
+
+
+class StubServer:
+    """
+    Serves paginated matches, message histories, recommendations, likes and updates.
+    """
+
+    def __init__(
+        self,
+        matches: int = 300,
+        messages: int = 20,
+        recommendations: int = 30,
+        likes: int = 30,
+        page_size: int = 60,
+        latency: float = 0.0,
+        lost_sends: float = 0.0,
+        port: int = 0,
+    ):
+        """
+        Creates a new stub server.
+
+        :param matches: the amount of matches of the account
+        :param messages: the amount of messages per match
+        :param recommendations: the amount of recommendations per request
+        :param likes: the amount of liked users and like previews, every tenth like is expired
+        :param page_size: the amount of matches and messages per page
+        :param latency: the seconds to wait before answering, to emulate the network
+        :param lost_sends: the share of sent messages that are stored but answered with
+        <em>502 Bad Gateway</em>, to emulate lost responses
+        :param port: the port to listen on, default a free port
+        """
+
+        self.matches: int = matches
+        self.messages: int = messages
+        self.recommendations: int = recommendations
+        self.likes: int = likes
+        self.page_size: int = page_size
+        self.latency: float = latency
+        self.lost_sends: float = lost_sends
+        self.sent: Dict[str, List[dict]] = defaultdict(list)
+        """The messages sent per match id"""
+        self._random = Random(0)
+        self.requests: int = 0
+        self._recs_served: int = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="tinder-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @lru_cache(maxsize=None)
+    def _match(self, i: int) -> dict:
+        return fixtures.match(i)
+
+    def _match_index(self, match_id: str) -> int:
+        return int(match_id[:24], 16)
+
+    def respond(self, method: str, path: str, query: dict, body: dict):
+        """
+        Gets the status and payload of a request.
+
+        :param method: the HTTP method
+        :param path: the path without query
+        :param query: the parsed query
+        :param body: the json body
+        :return: the status code and the payload
+        """
+
+        with self._lock:
+            self.requests += 1
+        page = int(query.get("page_token", ["0"])[0])
+        if path == "/v2/matches":
+            end = min(self.matches, page + self.page_size)
+            data = {"matches": [self._match(i) for i in range(page, end)]}
+            if end < self.matches:
+                data["next_page_token"] = str(end)
+            return 200, {"meta": {"status": 200}, "data": data}
+        found = re.fullmatch(r"/v2/matches/(\w+)/messages", path)
+        if found:
+            match_id = found.group(1)
+            end = min(self.messages, page + self.page_size)
+            data = {"messages": [fixtures.message(match_id, i) for i in range(page, end)]}
+            if page == 0:
+                with self._lock:
+                    data["messages"][:0] = reversed(self.sent.get(match_id, ()))
+            if end < self.messages:
+                data["next_page_token"] = str(end)
+            return 200, {"meta": {"status": 200}, "data": data}
+        found = re.fullmatch(r"/v2/matches/(\w+)", path)
+        if found:
+            return 200, {"data": self._match(self._match_index(found.group(1)))}
+        found = re.fullmatch(r"/user/matches/(\w+)", path)
+        if found and method == "POST":
+            match_id = found.group(1)
+            message = fixtures.message(match_id, self.messages)
+            message["message"] = body.get("message", "")
+            # sent by the self user to the user of the match
+            message["from"], message["to"] = fixtures.self_id, match_id[:24]
+            message["sent_date"] = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+            with self._lock:
+                message["_id"] = f"{match_id}s{len(self.sent[match_id]):06d}"
+                self.sent[match_id].append(message)
+                lost = self._random.random() < self.lost_sends
+            return (502, {"status": 502}) if lost else (200, message)
+        if path == "/recs/core":
+            with self._lock:
+                start = self._recs_served
+                self._recs_served += self.recommendations
+            users = [fixtures.recommendation(i) for i in range(start, start + self.recommendations)]
+            return 200, {"status": 200, "results": users}
+        if path in ("/v2/my-likes", "/v2/fast-match/teasers"):
+            end = min(self.likes, page + self.page_size)
+            results = []
+            for i in range(page, end):
+                if path == "/v2/my-likes":
+                    result = fixtures.liked_user(i)
+                else:
+                    result = {"type": "user", "user": fixtures.recommendation(i)}
+                result["expire_time"] = 946684800000 if i % 10 == 9 else 1893456000000
+                results.append(result)
+            data = {"results": results}
+            if end < self.likes:
+                data["page_token"] = str(end)
+            return 200, {"data": data}
+        if path == "/updates" and method == "POST":
+            return 200, fixtures.update(0, matches=5)
+        if path == "/profile":
+            return 200, fixtures.self_user()
+        if re.fullmatch(r"/(like|pass)/\w+(/super)?", path):
+            return 200, {"status": 200, "likes_remaining": 100}
+        return 404, {"status": 404}
+
+
+def _handler(server: StubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            # headers and body are sent separately, without this delayed ACKs add 40 ms
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def _answer(self, method: str):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else {}
+            parts = urlsplit(self.path)
+            if server.latency > 0:
+                time.sleep(server.latency)
+            status, payload = server.respond(method, parts.path, parse_qs(parts.query), body)
+            content = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            self._answer("GET")
+
+        def do_POST(self):
+            self._answer("POST")
+
+        def do_DELETE(self):
+            self._answer("DELETE")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,181 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CachedResponse:
+    """
+    A parsed response together with its HTTP validators.
+    """
+
+    __slots__ = ["etag", "last_modified", "entity", "size"]
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], entity: Any, size: int):
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+        self.entity = entity
+        self.size: int = size
+
+    def validators(self) -> dict:
+        """
+        Gets the headers to revalidate the response with.
+
+        :return: the conditional request headers
+        """
+
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    LRU cache of parsed responses, bounded by the size of the response bodies.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Creates a new response cache.
+
+        :param max_bytes: the maximum total size of all cached response bodies
+        """
+
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            self.invalidate(key)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def invalidate(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"ResponseCache({len(self)} entries, {self.size}/{self.max_bytes} bytes)"
+
+
+class EntityCache:
+    """
+    LRU cache of parsed users keyed by class, id and `content_hash`. A changed content hash
+    means the profile changed, so the user is parsed again.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Creates a new entity cache.
+
+        :param max_size: the maximum amount of cached entities
+        """
+
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self,
+        cls: type,
+        user_id: str,
+        content_hash: str,
+        build: Callable[[], T],
+        refresh: Callable[[T], None] = None,
+    ) -> T:
+        """
+        Gets the cached entity or builds and caches it.
+
+        :param cls: the entity class
+        :param user_id: the user id
+        :param content_hash: the content hash of the user
+        :param build: builds the entity on a cache miss
+        :param refresh: updates a cached entity with the fields the content hash does not cover,
+        e.g. the distance
+        :return: the entity
+        """
+
+        key = (cls, user_id, content_hash)
+        with self._lock:
+            entity = self._entries.get(key)
+            if entity is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entity is not None:
+            if refresh is not None:
+                refresh(entity)
+            return entity
+        with self._lock:
+            self.misses += 1
+        entity = build()
+        with self._lock:
+            self._entries[key] = entity
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entity
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self) -> dict:
+        """
+        Gets the cache statistics.
+
+        :return: size, hits, misses, evictions and hit rate
+        """
+
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"EntityCache({len(self)}/{self.max_size}, {self.hit_rate():.0%} hits)"
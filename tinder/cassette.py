@@ -0,0 +1,167 @@
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from tinder.transport import Response, Transport
+
+_scrubbed = "<scrubbed>"
+_secret_headers = ("x-auth-token", "authorization", "cookie", "set-cookie")
+
+
+def _route(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class RecordingTransport(Transport):
+    """
+    Wraps a transport and records every request and response to a gzipped NDJSON cassette.
+    The auth token is removed from headers, urls and payloads.
+    """
+
+    def __init__(self, transport: Transport, path: str, token: Optional[str] = None):
+        """
+        Creates a new recording transport.
+
+        :param transport: the transport to send the requests with
+        :param path: the cassette file, e.g. `run.ndjson.gz`
+        :param token: the auth token to scrub in addition to the auth headers
+        """
+
+        self._transport = transport
+        self._token = token
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _scrub(self, text: str) -> str:
+        if self._token:
+            return text.replace(self._token, _scrubbed)
+        return text
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        start = time.monotonic()
+        # the whole body is recorded, so streamed responses are buffered
+        response = self._transport.request(method, url, headers, body, timeout)
+        elapsed = time.monotonic() - start
+        try:
+            content = {"text": self._scrub(response.content.decode("utf-8"))}
+        except UnicodeDecodeError:
+            content = {"base64": base64.b64encode(response.content).decode("ascii")}
+        record = {
+            "method": method,
+            "route": self._scrub(_route(url)),
+            "body": json.loads(self._scrub(json.dumps(body))) if body is not None else None,
+            "status": response.status_code,
+            "headers": {
+                key: _scrubbed if key in _secret_headers else value
+                for key, value in response.headers.items()
+            },
+            "elapsed": round(elapsed, 4),
+            **content,
+        }
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                # a sync flush keeps every recorded exchange readable if the process dies
+                self._file.flush()
+        return response
+
+    def stop(self) -> Transport:
+        """
+        Finishes the cassette without closing the wrapped transport.
+
+        :return: the wrapped transport
+        """
+
+        with self._lock:
+            self._file.close()
+        return self._transport
+
+    def close(self):
+        self.stop().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves requests from a cassette recorded by `RecordingTransport`. Requests are matched by
+    method and route; repeated requests are answered in recording order and the last response
+    is repeated once a route is exhausted. Replayed requests skip the rate limits.
+    """
+
+    local = True
+
+    def __init__(self, path: str, emulate_timing: float = 0.0, strict: bool = False):
+        """
+        Creates a new replay transport.
+
+        :param path: the cassette file
+        :param emulate_timing: sleeps for the recorded duration multiplied by this factor,
+        default 0 to answer immediately
+        :param strict: raise on requests that are not inside the cassette instead of
+        answering with 404
+        """
+
+        self.emulate_timing: float = emulate_timing
+        self.strict: bool = strict
+        self._records: Dict[Tuple[str, str], Deque[dict]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[(record["method"], record["route"])].append(record)
+            except (EOFError, ValueError):
+                # the cassette of a crashed recording ends without trailer or mid-line
+                pass
+
+    def _next(self, method: str, route: str) -> Optional[dict]:
+        key = (method, route)
+        with self._lock:
+            records = self._records.get(key)
+            if records:
+                self._last[key] = records.popleft()
+            return self._last.get(key)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        record = self._next(method, _route(url))
+        if record is None:
+            if self.strict:
+                raise LookupError(f"No recorded response for {method} {url}!")
+            return Response(404, {}, b"{}", url)
+        if self.emulate_timing > 0:
+            time.sleep(record["elapsed"] * self.emulate_timing)
+        if "base64" in record:
+            content = base64.b64decode(record["base64"])
+        else:
+            content = record["text"].encode("utf-8")
+        return Response(record["status"], record["headers"], content, url)
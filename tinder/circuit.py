@@ -0,0 +1,177 @@
+import threading
+import time
+from enum import Enum
+from typing import Dict, Optional
+
+from tinder.metrics import Metrics
+
+
+class CircuitState(Enum):
+    """
+    The state of a circuit breaker.
+    """
+
+    CLOSED = 0
+    """Requests pass"""
+    OPEN = 1
+    """Requests fail fast until the cooldown is over"""
+    HALF_OPEN = 2
+    """A limited amount of probe requests pass to test whether the route recovered"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a single route template.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, probes: int = 1):
+        """
+        Creates a new circuit breaker.
+
+        :param failure_threshold: consecutive failures after which the circuit opens
+        :param cooldown: seconds the circuit stays open before probe requests are let through
+        :param probes: the amount of concurrent probe requests while half-open
+        """
+
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self.probes: int = probes
+        self.state: CircuitState = CircuitState.CLOSED
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self._probing: int = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Checks whether a request may be sent. Moves an open circuit to half-open once the
+        cooldown is over.
+
+        :return: `true` if the request may be sent
+        """
+
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._probing = 0
+            if self.state == CircuitState.HALF_OPEN:
+                if self._probing >= self.probes:
+                    return False
+                self._probing += 1
+            return True
+
+    def release(self):
+        """
+        Frees the probe slot of a request that was allowed but never got a response, e.g.
+        because its deadline expired while it waited for the rate limit.
+        """
+
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self._probing > 0:
+                self._probing -= 1
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probing = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+                self._probing = 0
+
+    def retry_in(self) -> float:
+        """
+        Gets the remaining cooldown of an open circuit.
+
+        :return: the remaining seconds, 0 if the circuit is not open
+        """
+
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def __str__(self):
+        return f"CircuitBreaker({self.state.name}:{self.failures} failures)"
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers per route template. Share one instance between several clients to let all
+    of them fail fast during an outage.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        probes: int = 1,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Creates a new circuit breaker registry.
+
+        :param failure_threshold: consecutive failures after which a circuit opens
+        :param cooldown: seconds a circuit stays open before probe requests are let through
+        :param probes: the amount of concurrent probe requests while half-open
+        :param metrics: publishes the state of each circuit as `circuit.<route>` gauge
+        """
+
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self.probes: int = probes
+        self.metrics: Optional[Metrics] = metrics
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, template: str) -> CircuitBreaker:
+        breaker = self._breakers.get(template)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    template, CircuitBreaker(self.failure_threshold, self.cooldown, self.probes)
+                )
+        return breaker
+
+    def allow(self, template: str) -> bool:
+        allowed = self.get(template).allow()
+        self._publish(template)
+        return allowed
+
+    def release(self, template: str):
+        self.get(template).release()
+        self._publish(template)
+
+    def record_success(self, template: str):
+        self.get(template).record_success()
+        self._publish(template)
+
+    def record_failure(self, template: str):
+        self.get(template).record_failure()
+        self._publish(template)
+
+    def _publish(self, template: str):
+        if self.metrics is not None:
+            self.metrics.set_gauge(f"circuit.{template}", self.get(template).state.value)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Gets the state of all circuits.
+
+        :return: the state, failures and remaining cooldown per route template
+        """
+
+        return {
+            template: {
+                "state": breaker.state.name,
+                "failures": breaker.failures,
+                "retry_in": round(breaker.retry_in(), 3),
+            }
+            for template, breaker in list(self._breakers.items())
+        }
@@ -0,0 +1,181 @@
+"""
+The `tinder-py` command line tool for bulk jobs:
+
+    tinder-py --token <token> sync ./mirror
+    tinder-py --token <token> export messages messages.csv.gz --lookahead 16
+    tinder-py bench client streaming
+    tinder-py stats metrics.json
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import Iterator, List
+
+from tinder.export import open_writer, user_fields, user_record, writers
+
+benchmarks = (
+    "client",
+    "activity",
+    "interning",
+    "likes",
+    "serialization",
+    "streaming",
+    "memory",
+    "outbox",
+    "pagination",
+    "search",
+    "import_time",
+)
+"""The modules of `tinder.benchmarks` the `bench` command can run"""
+
+
+def _client(args):
+    from tinder.ratelimit import RateControllers
+    from tinder.tinder import TinderClient
+
+    token = args.token or os.environ.get("TINDER_TOKEN")
+    if not token:
+        raise SystemExit("No auth token, pass --token or set TINDER_TOKEN")
+    return TinderClient(
+        token,
+        getattr(logging, args.log_level),
+        args.ratelimit,
+        request_timeout=args.timeout,
+        rate_controllers=RateControllers() if args.adaptive else None,
+        base_url=args.base_url,
+    )
+
+
+def _dump_metrics(client, args):
+    if args.metrics_out:
+        with open(args.metrics_out, "w") as file:
+            json.dump(client.metrics, file, indent=2, sort_keys=True)
+
+
+def _recommendations(client, pages: int) -> Iterator[dict]:
+    for _ in range(pages):
+        for recommendation in client.get_recommendations():
+            yield user_record(recommendation)
+
+
+def sync(args) -> int:
+    from tinder.sync import Mirror
+
+    client = _client(args)
+    start = time.perf_counter()
+    new = Mirror(client, args.directory, args.lookahead).sync()
+    elapsed = time.perf_counter() - start
+    print(f"{new['matches']} new matches, {new['messages']} new messages in {elapsed:.2f} s")
+    _dump_metrics(client, args)
+    return 0
+
+
+def export(args) -> int:
+    client = _client(args)
+    start = time.perf_counter()
+    if args.entity == "matches":
+        count = client.export_matches(args.out, args.format, args.chunk_size)
+    elif args.entity == "messages":
+        count = client.export_messages(args.out, args.format, args.chunk_size, args.lookahead)
+    else:
+        with open_writer(args.out, user_fields, args.format, args.chunk_size) as writer:
+            count = writer.write_all(_recommendations(client, args.pages))
+    elapsed = time.perf_counter() - start
+    print(f"{count} {args.entity} written to {args.out} in {elapsed:.2f} s")
+    _dump_metrics(client, args)
+    return 0
+
+
+def bench(args) -> int:
+    unknown = set(args.names) - set(benchmarks)
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks {', '.join(sorted(unknown))}")
+    results = {}
+    for name in args.names or ["client"]:
+        module = importlib.import_module(f"tinder.benchmarks.{name}")
+        results[name] = module.run()
+    print(json.dumps(results, indent=2, default=str))
+    return 0
+
+
+def stats(args) -> int:
+    with open(args.path) as file:
+        snapshot = json.load(file)
+    counters = snapshot.get("counters", {})
+    if counters:
+        print("counters:")
+        for name in sorted(counters):
+            print(f"  {name:<48} {counters[name]:>10}")
+    gauges = snapshot.get("gauges", {})
+    if gauges:
+        print("gauges:")
+        for name in sorted(gauges):
+            print(f"  {name:<48} {gauges[name]:>10}")
+    timings = snapshot.get("timings", {})
+    if timings:
+        print(f"timings:{'count':>51} {'mean ms':>10} {'max ms':>10}")
+        for name in sorted(timings):
+            timing = timings[name]
+            print(
+                f"  {name:<48} {timing['count']:>10} "
+                f"{timing['mean'] * 1000:>10.1f} {timing['max'] * 1000:>10.1f}"
+            )
+    for section in ("circuits", "ratelimit", "entity_cache"):
+        if snapshot.get(section):
+            print(f"{section}:")
+            print(json.dumps(snapshot[section], indent=2))
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    root = argparse.ArgumentParser(prog="tinder-py", description=__doc__.split("\n\n")[0])
+    root.add_argument("--token", help="the X-Auth-Token, default the TINDER_TOKEN variable")
+    root.add_argument("--base-url", help="the API to send requests to")
+    root.add_argument("--ratelimit", type=int, default=10, help="the ratelimit multiplicator")
+    root.add_argument(
+        "--adaptive", action="store_true", help="adapt the request rate to 429 responses"
+    )
+    root.add_argument("--timeout", type=float, default=30.0, help="the seconds per request")
+    root.add_argument(
+        "--log-level", default="WARNING", choices=("DEBUG", "INFO", "WARNING", "ERROR")
+    )
+    root.add_argument("--metrics-out", help="write the request metrics to this json file")
+    commands = root.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("sync", help="mirror new matches and messages")
+    command.add_argument("directory")
+    command.add_argument("--lookahead", type=int, default=8)
+    command.set_defaults(run=sync)
+
+    command = commands.add_parser("export", help="export matches, messages or recommendations")
+    command.add_argument("entity", choices=("matches", "messages", "recommendations"))
+    command.add_argument("out", help="the file to write, .gz to compress csv and ndjson")
+    command.add_argument("--format", choices=tuple(writers), help="default the file extension")
+    command.add_argument("--chunk-size", type=int, default=1000)
+    command.add_argument("--pages", type=int, default=1, help="the recommendation requests")
+    command.add_argument("--lookahead", type=int, default=8)
+    command.set_defaults(run=export)
+
+    command = commands.add_parser("bench", help="run benchmarks against a local stub")
+    command.add_argument("names", nargs="*", help=f"default client, one of {', '.join(benchmarks)}")
+    command.set_defaults(run=bench)
+
+    command = commands.add_parser("stats", help="print request metrics")
+    command.add_argument("path", help="a file written by --metrics-out")
+    command.set_defaults(run=stats)
+    return root
+
+
+def main(argv: List[str] = None) -> int:
+    args = parser().parse_args(argv)
+    logging.basicConfig(level=getattr(logging, args.log_level))
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from tinder.exceptions import Cancelled, DeadlineExceeded
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation of long running operations. Cancelling interrupts pending rate
+    limit waits and stops before the next request is sent.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleeps for `seconds` unless the token is cancelled earlier.
+
+        :param seconds: the seconds to sleep
+        :return: `true` if the token was cancelled
+        """
+
+        return self._event.wait(seconds)
+
+
+_current = ContextVar("tinder_deadline", default=None)
+
+
+def current_deadline() -> Optional["Deadline"]:
+    """
+    Gets the deadline of the enclosing `with Deadline(...)` block.
+
+    :return: the current deadline, `None` if there is none
+    """
+
+    return _current.get()
+
+
+class Deadline:
+    """
+    A time budget for one or more requests, covering connect and read timeouts, retries and rate
+    limit waits. Use it as a context manager to apply it to every request inside the block;
+    nested deadlines never extend the enclosing one.
+
+    >>> with Deadline(30, token):
+    ...     client.load_all_matches()
+    """
+
+    def __init__(self, timeout: Optional[float] = None, token: CancellationToken = None):
+        """
+        Creates a new deadline, starting now.
+
+        :param timeout: the budget in seconds, `None` for no time limit
+        :param token: cancels the operations governed by this deadline
+        """
+
+        self.expires_at: Optional[float] = None
+        if timeout is not None:
+            self.expires_at = time.monotonic() + timeout
+        self.token: Optional[CancellationToken] = token
+        self._origin: Optional[Deadline] = None
+        """The deadline entered by a `with` block, see `__enter__`"""
+        self._parent: Optional[Deadline] = None
+        self._reset = None
+
+    def remaining(self) -> Optional[float]:
+        """
+        Gets the remaining budget.
+
+        :return: the remaining seconds, `None` if unlimited
+        """
+
+        remaining = None
+        if self.expires_at is not None:
+            remaining = max(0.0, self.expires_at - time.monotonic())
+        for enclosing in (self._origin, self._parent):
+            if enclosing is not None:
+                limit = enclosing.remaining()
+                if limit is not None and (remaining is None or limit < remaining):
+                    remaining = limit
+        return remaining
+
+    @property
+    def cancelled(self) -> bool:
+        if self.token is not None and self.token.cancelled:
+            return True
+        return any(d is not None and d.cancelled for d in (self._origin, self._parent))
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self):
+        """
+        Raises if the deadline is cancelled or expired.
+        """
+
+        if self.cancelled:
+            raise Cancelled("The operation was cancelled.")
+        if self.expired:
+            raise DeadlineExceeded("The deadline was exceeded.")
+
+    def timeout(self, default: Optional[float]) -> Optional[float]:
+        """
+        Gets the socket timeout for the next request.
+
+        :param default: the timeout to use if the remaining budget is larger
+        :return: the timeout in seconds
+        """
+
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if default is None:
+            return remaining
+        return min(default, remaining)
+
+    def sleep(self, seconds: float):
+        """
+        Waits for `seconds`, interrupted by cancellation. Raises right away if the wait would
+        exceed the deadline.
+
+        :param seconds: the seconds to wait
+        """
+
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and seconds > remaining:
+            raise DeadlineExceeded(f"Waiting {seconds} secs would exceed the deadline.")
+        token = self._token()
+        if token is None:
+            time.sleep(seconds)
+        elif token.wait(seconds):
+            raise Cancelled("The operation was cancelled.")
+
+    def _token(self) -> Optional[CancellationToken]:
+        if self.token is not None:
+            return self.token
+        for enclosing in (self._origin, self._parent):
+            token = enclosing._token() if enclosing is not None else None
+            if token is not None:
+                return token
+        return None
+
+    def __enter__(self) -> "Deadline":
+        # each block gets its own deadline holding the enclosing one and the reset token, so the
+        # same deadline can be entered by several threads or contexts at once
+        block = Deadline()
+        block._origin = self
+        block._parent = _current.get()
+        block._reset = _current.set(block)
+        return block
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        block = _current.get()
+        if block is None or block._origin is not self:
+            raise RuntimeError(f"{self} is not the deadline of the current block!")
+        _current.reset(block._reset)
+
+    def __str__(self):
+        return f"Deadline({self.remaining()} secs)"
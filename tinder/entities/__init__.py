@@ -1 +1,26 @@
-from . import *
+import importlib
+
+_submodules = {
+    "dates",
+    "entity",
+    "intern",
+    "match",
+    "message",
+    "photo",
+    "serialization",
+    "socials",
+    "update",
+    "user",
+}
+
+__all__ = sorted(_submodules)
+
+
+def __getattr__(name: str):
+    if name in _submodules:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _submodules)
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Union
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: Union[str, int, None]) -> Optional[datetime]:
+    """
+    Parses a date of the API, given as ISO 8601 string or as milliseconds since the epoch.
+    Repeated values, e.g. the dates of a match, are parsed only once.
+
+    :param value: the date
+    :return: the date in UTC, `None` if the value is empty
+    """
+
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return datetime.fromtimestamp(value / 1000, timezone.utc)
+
+
+def to_millis(value: Union[str, int, None]) -> int:
+    """
+    Converts a date of the API into milliseconds since the epoch, e.g. to compare or sort
+    dates given in different formats.
+
+    :param value: the date
+    :return: the milliseconds, 0 if the value is empty
+    """
+
+    if isinstance(value, int):
+        return value
+    date = parse_date(value)
+    return 0 if date is None else int(date.timestamp() * 1000)
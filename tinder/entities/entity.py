@@ -1,3 +1,4 @@
+from tinder.entities import serialization
 from tinder.http import Http
 
 
@@ -17,5 +18,44 @@ class Entity:
         else:
             raise TypeError("Not an entity!")
 
+    def to_bytes(self, compress: bool = False) -> bytes:
+        """
+        Serializes the entity into a compact binary record. The `Http` handle is not included.
+
+        :param compress: `true` to additionally compress the record
+        :return: the binary record
+        """
+
+        return serialization.dumps(self, compress)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, http: Http, client=None):
+        """
+        Deserializes an entity created by `to_bytes` and binds it to `http`.
+
+        :param data: the binary record
+        :param http: the `Http` handle to bind the entity to
+        :param client: the client to bind matches to
+        :return: the entity
+        """
+
+        entity = serialization.loads(data, http, client)
+        if not isinstance(entity, cls):
+            raise TypeError(f"Not a {cls.__name__}!")
+        return entity
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for name in serialization.slot_names(type(self))
+            if name not in serialization.unbound and hasattr(self, name)
+        }
+
+    def __setstate__(self, state: dict):
+        for name in serialization.unbound.intersection(serialization.slot_names(type(self))):
+            setattr(self, name, None)
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __str__(self):
         return f"Tinder Entity({self.id})"
@@ -0,0 +1,162 @@
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _intern_strings(entity):
+    for cls in type(entity).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            value = getattr(entity, slot, None)
+            if type(value) is str:
+                setattr(entity, slot, sys.intern(value))
+
+
+class InternPool:
+    """
+    Shares identical sub-entities, such as interests, descriptors or Spotify artists, between all
+    entities built while the pool is active. The string fields of pooled entities are interned
+    as well.
+
+    Pooled entities are shared, so they must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 100000):
+        """
+        Creates a new intern pool.
+
+        :param max_size: the maximum amount of pooled entities. Once reached, new values are
+        built without being pooled
+        """
+
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entities: dict = {}
+
+    def get(self, cls: Type[T], raw: dict) -> T:
+        """
+        Gets the pooled entity for a raw dict, building and pooling it if absent.
+
+        :param cls: the entity class
+        :param raw: the raw dict to build the entity from
+        :return: the shared entity
+        """
+
+        key = (cls, _freeze(raw))
+        entity = self._entities.get(key)
+        if entity is not None:
+            self.hits += 1
+            return entity
+        self.misses += 1
+        entity = cls(raw)
+        if len(self._entities) < self.max_size:
+            _intern_strings(entity)
+            entity = self._entities.setdefault(key, entity)
+        return entity
+
+    def clear(self):
+        """
+        Removes all pooled entities.
+        """
+
+        self._entities.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        """
+        Gets the share of lookups that returned an already pooled entity.
+
+        :return: the hit rate between 0 and 1
+        """
+
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __str__(self):
+        return f"InternPool({len(self)} entities, {self.hit_rate():.0%} hits)"
+
+
+_pool: Optional[InternPool] = None
+_lock = threading.Lock()
+
+
+def build(cls: Type[T], raw: dict) -> T:
+    """
+    Builds a sub-entity, taking it from the active intern pool if interning is enabled.
+
+    :param cls: the entity class
+    :param raw: the raw dict to build the entity from
+    :return: the entity
+    """
+
+    pool = _pool
+    if pool is None:
+        return cls(raw)
+    return pool.get(cls, raw)
+
+
+def enable_interning(pool: Optional[InternPool] = None) -> InternPool:
+    """
+    Enables interning of sub-entities for the whole process.
+
+    :param pool: the pool to use, default a new pool
+    :return: the active pool
+    """
+
+    global _pool
+    with _lock:
+        _pool = pool if pool is not None else InternPool()
+        return _pool
+
+
+def disable_interning():
+    """
+    Disables interning. Already built entities keep sharing their sub-entities.
+    """
+
+    global _pool
+    with _lock:
+        _pool = None
+
+
+def get_intern_pool() -> Optional[InternPool]:
+    """
+    Gets the active intern pool.
+
+    :return: the active pool, `None` if interning is disabled
+    """
+
+    return _pool
+
+
+@contextmanager
+def interning(pool: Optional[InternPool] = None):
+    """
+    Enables interning inside a `with` block and restores the previous pool afterwards.
+
+    :param pool: the pool to use, default a new pool
+    """
+
+    global _pool
+    previous = _pool
+    active = enable_interning(pool)
+    try:
+        yield active
+    finally:
+        with _lock:
+            _pool = previous
@@ -1,12 +1,15 @@
+import threading
 from collections import deque
-from typing import Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
+from tinder.deadline import Deadline
 from tinder.entities.entity import Entity
 from tinder.entities.message import Message
 from tinder.entities.photo import MatchPhoto
 from tinder.entities.socials import FacebookInfo
 from tinder.entities.user import MatchedUser
 from tinder.http import Http
+from tinder.pagination import Paginator
 
 
 class Match(Entity):
@@ -51,7 +54,9 @@ class Match(Entity):
         self.created_date: str = match["created_date"]
         self.dead: bool = match["dead"]
         self.last_activity_date: str = match["last_activity_date"]
-        self.message_history: MessageHistory = MessageHistory(http, self.id)
+        self.message_history: MessageHistory = MessageHistory(
+            http, self.id, getattr(client, "message_index", None)
+        )
         self.pending: bool = match["pending"]
         self.is_super_like: bool = match["is_super_like"]
         self.is_boost_match: bool = match["is_boost_match"]
@@ -104,7 +109,11 @@ class Match(Entity):
         """
 
         self.http.make_request(method="DELETE", route=f"match/{self.id}")
-        self._client.invalidate_match(self)
+        if self._client is not None:
+            self._client.invalidate_match(self)
+        activity_index = getattr(self._client, "activity_index", None)
+        if activity_index is not None:
+            activity_index.remove(self.id)
 
     def __str__(self):
         return f"Match({self.id}:{self.matched_user})"
@@ -121,20 +130,69 @@ class MessageHistory:
     For example, a message at index 0 is more recent than a message at index 1.
     """
 
-    def __init__(self, http: Http, match_id: str):
+    def __init__(self, http: Http, match_id: str, index=None):
+        """
+        Creates a new message history.
+
+        :param http: the http handle
+        :param match_id: the id of the match
+        :param index: a `MessageIndex` to add the cached messages to
+        """
+
         self._messages: deque = deque()
         self.http: Http = http
+        self.index = index
         self._match_id = match_id
+        self._page_token = None
+        self._loaded: bool = False
+        self._lock = threading.Lock()
 
-    def _fetch_initial_messages(self):
+    def _fetch_page(
+        self, page_token: Optional[str], deadline: Deadline = None
+    ) -> Tuple[List[dict], Optional[str]]:
         route = f"/v2/matches/{self._match_id}/messages?count=60"
-        data = self.http.make_request(method="GET", route=route).json()["data"]
-        if "next_page_token" in data:
-            self._page_token = data["next_page_token"]
-        else:
-            self._page_token = None
+        if page_token:
+            route = f"{route}&page_token={page_token}"
+
+        response = self.http.make_request(method="GET", route=route, deadline=deadline)
+        data = response.json()["data"]
+        return data["messages"], data.get("next_page_token")
+
+    def _paginate(self, page_token: str, deadline: Deadline = None) -> Paginator[Message]:
+        return Paginator(
+            lambda token: self._fetch_page(token, deadline),
+            lambda message: Message(message, self.http),
+            page_token,
+        )
+
+    def _fetch_initial_messages(self):
+        messages, self._page_token = self._fetch_page(None)
+        self._cache(Message(m, self.http) for m in messages)
+        self._loaded = True
+
+    def _cache(self, messages: Iterable[Message]):
+        if self.index is not None:
+            messages = tuple(messages)
+            self.index.add_all(messages)
+        self._messages.extendleft(messages)
+
+    @property
+    def loaded(self) -> bool:
+        """`true` if the first page of messages is cached"""
+        return self._loaded
+
+    def prefetch(self) -> int:
+        """
+        Requests the first page of messages unless it is cached already. Safe to call from
+        several threads; the page is requested only once.
+
+        :return: the amount of cached messages
+        """
 
-        self._messages.extendleft(Message(m, self.http) for m in data["messages"])
+        with self._lock:
+            if not self._loaded:
+                self._fetch_initial_messages()
+            return len(self._messages)
 
     def get_message_by_id(self, message_id: str) -> Message:
         """
@@ -161,36 +219,54 @@ class MessageHistory:
         :return: all messages inside the cache
         """
 
-        self._fetch_initial_messages()
+        self.prefetch()
         return tuple(self._messages)
 
-    def load_all_messages(self) -> Tuple[Message]:
+    def load_all_messages(self, deadline: Deadline = None) -> Tuple[Message]:
         """
         Requests all messages from the Tinder API.
 
+        :param deadline: limits the time and allows cancelling the requests of all pages
         :return: all messages of a match
         """
 
-        self._fetch_initial_messages()
+        if deadline is not None:
+            with deadline:
+                return self.load_all_messages()
+
+        with self._lock:
+            if not self._loaded:
+                self._fetch_initial_messages()
+
+            if self._page_token is None:
+                return tuple(self._messages)
+
+            self._cache(self._load_messages(self._page_token))
+            self._page_token = None
 
-        if self._page_token is None:
             return tuple(self._messages)
 
-        self._messages.extendleft(self._load_messages(self._page_token))
+    def iter_messages(self, deadline: Deadline = None) -> Iterator[Message]:
+        """
+        Iterates all messages from recent to past. Messages that are not cached yet are
+        requested page by page and are not added to the cache.
 
-        return tuple(self._messages)
+        :param deadline: limits the time and allows cancelling the requests of all pages
+        :return: all messages of a match
+        """
 
-    def _load_messages(self, page_token: str = None) -> Tuple[Message]:
-        route = f"/v2/matches/{self._match_id}/messages?count=60"
-        if page_token:
-            route = f"{route}&page_token={page_token}"
+        with self._lock:
+            if not self._loaded:
+                self._fetch_initial_messages()
+            cached = tuple(self._messages)
+            page_token = self._page_token
+        yield from reversed(cached)
 
-        data = self.http.make_request(method="GET", route=route).json()["data"]
-        messages: list = list(Message(m, self.http) for m in data["messages"])
-        if "next_page_token" in data:
-            messages.extend(self._load_messages(data["next_page_token"]))
+        if page_token:
+            yield from self._paginate(page_token, deadline)
 
-        return tuple(messages)
+    def _load_messages(self, page_token: str = None) -> Tuple[Message]:
+        return tuple(self._paginate(page_token))
 
     def size(self):
         """
@@ -209,3 +285,16 @@ class MessageHistory:
         """
 
         self._messages.append(message)
+        if self.index is not None:
+            self.index.add(message)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["http"] = None
+        state["index"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,187 @@
+import marshal
+import zlib
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Tuple
+
+_magic = b"TE"
+_version = 1
+_compressed = 0x80
+_list_tag = 0
+_missing = ...
+_scalars = frozenset([str, int, float, bool, bytes, type(None), type(_missing)])
+
+unbound = frozenset(["http", "_client", "_pending_edit"])
+"""Attributes that are dropped on serialization and rebound on deserialization."""
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls: type) -> Tuple[str, ...]:
+    """
+    Gets the names of all slots of a class and its bases, in definition order.
+
+    :param cls: the class
+    :return: the slot names
+    """
+
+    names = []
+    for base in reversed(cls.__mro__):
+        for name in base.__dict__.get("__slots__", ()):
+            if name not in names and name not in ("__dict__", "__weakref__"):
+                names.append(name)
+    return tuple(names)
+
+
+@lru_cache(maxsize=None)
+def _registry() -> Tuple[tuple, dict, bytes]:
+    from tinder.entities import entity, match, message, photo, socials, update, user
+
+    classes = set()
+    for module in (entity, match, message, photo, socials, update, user):
+        for value in vars(module).values():
+            if isinstance(value, type) and value.__module__ == module.__name__:
+                classes.add(value)
+    classes.add(datetime)
+    classes.add(deque)
+    ordered = tuple(sorted(classes, key=lambda c: f"{c.__module__}.{c.__qualname__}"))
+    names = ",".join(f"{c.__module__}.{c.__qualname__}" for c in ordered)
+    codes = {cls: code for code, cls in enumerate(ordered, start=1)}
+    return ordered, codes, zlib.crc32(names.encode()).to_bytes(4, "little")
+
+
+def _encode(value, codes: dict):
+    if value is None or value is _missing or isinstance(value, (str, int, float, bytes)):
+        return value
+    cls = type(value)
+    if cls is tuple:
+        return tuple(item if type(item) in _scalars else _encode(item, codes) for item in value)
+    if cls is list:
+        return [_list_tag] + [
+            item if type(item) in _scalars else _encode(item, codes) for item in value
+        ]
+    if cls is dict:
+        return {
+            key: item if type(item) in _scalars else _encode(item, codes)
+            for key, item in value.items()
+        }
+    code = codes.get(cls)
+    if code is None:
+        raise TypeError(f"Cannot serialize {cls.__name__}!")
+    if isinstance(value, Enum):
+        return [code, value.value]
+    if cls is datetime:
+        return [code, value.isoformat()]
+    if cls is deque:
+        return [code] + [_encode(item, codes) for item in value]
+    if hasattr(value, "__dict__"):
+        state = value.__getstate__() if "__getstate__" in cls.__dict__ else vars(value)
+        state = {
+            key: _encode(item, codes)
+            for key, item in state.items()
+            if key not in unbound and not key.startswith("__")
+        }
+        return [code, state]
+    encoded = [code]
+    for name in slot_names(cls):
+        item = _missing if name in unbound else getattr(value, name, _missing)
+        encoded.append(item if type(item) in _scalars else _encode(item, codes))
+    return encoded
+
+
+@lru_cache(maxsize=None)
+def _bound(cls: type) -> Tuple[bool, bool]:
+    names = slot_names(cls)
+    return "http" in names, "_client" in names
+
+
+def _decode(value, classes: tuple, http, client):
+    cls = type(value)
+    # scalars are returned as they are; skipping the call for them halves the decoding time
+    if cls is tuple:
+        return tuple(
+            item if type(item) in _scalars else _decode(item, classes, http, client)
+            for item in value
+        )
+    if cls is dict:
+        return {
+            key: item if type(item) in _scalars else _decode(item, classes, http, client)
+            for key, item in value.items()
+        }
+    if cls is not list:
+        return value
+    code = value[0]
+    if code == _list_tag:
+        return [
+            item if type(item) in _scalars else _decode(item, classes, http, client)
+            for item in value[1:]
+        ]
+    target = classes[code - 1]
+    if issubclass(target, Enum):
+        return target(value[1])
+    if target is datetime:
+        return datetime.fromisoformat(value[1])
+    if target is deque:
+        return deque(_decode(item, classes, http, client) for item in value[1:])
+    entity = target.__new__(target)
+    if "__slots__" not in target.__dict__:
+        state = {key: _decode(item, classes, http, client) for key, item in value[1].items()}
+        if "__setstate__" in target.__dict__:
+            entity.__setstate__(state)
+        else:
+            entity.__dict__.update(state)
+        entity.http = http
+        return entity
+    for name, item in zip(slot_names(target), value[1:]):
+        if item is _missing:
+            continue
+        if type(item) not in _scalars:
+            item = _decode(item, classes, http, client)
+        setattr(entity, name, item)
+    has_http, has_client = _bound(target)
+    if has_http:
+        entity.http = http
+    if has_client:
+        entity._client = client
+    return entity
+
+
+def dumps(entity, compress: bool = False) -> bytes:
+    """
+    Serializes an entity into a compact binary record. The `Http` handle and the client are
+    dropped.
+
+    :param entity: the entity to serialize
+    :param compress: `true` to additionally compress the record
+    :return: the binary record
+    """
+
+    _, codes, digest = _registry()
+    payload = marshal.dumps(_encode(entity, codes), 4)
+    flags = _version
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= _compressed
+    return _magic + bytes([flags]) + digest + payload
+
+
+def loads(data: bytes, http=None, client=None):
+    """
+    Deserializes an entity from a binary record created by `dumps`.
+
+    :param data: the binary record
+    :param http: the `Http` handle to bind the entity to
+    :param client: the client to bind matches to
+    :return: the entity
+    """
+
+    classes, _, digest = _registry()
+    if data[:2] != _magic or data[2] & ~_compressed != _version:
+        raise ValueError("Not a serialized entity!")
+    if data[3:7] != digest:
+        raise ValueError("The entity was serialized by an incompatible version!")
+    payload = data[7:]
+    if data[2] & _compressed:
+        payload = zlib.decompress(payload)
+    return _decode(marshal.loads(payload), classes, http, client)
@@ -1,5 +1,6 @@
 from typing import Tuple
 
+from tinder.entities.intern import build
 from tinder.entities.photo import SizedImage
 
 
@@ -98,8 +99,10 @@ class GenericSpotifyTrack(SpotifyEntity):
 
     def __init__(self, track: dict):
         super().__init__(track)
-        self.album: SpotifyAlbum = SpotifyAlbum(track["album"])
-        self.artists: Tuple[SpotifyEntity] = tuple(SpotifyEntity(a) for a in track["artists"])
+        self.album: SpotifyAlbum = build(SpotifyAlbum, track["album"])
+        self.artists: Tuple[SpotifyEntity] = tuple(
+            build(SpotifyEntity, a) for a in track["artists"]
+        )
 
 
 class SpotifyTrack(GenericSpotifyTrack):
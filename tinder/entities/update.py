@@ -1,4 +1,5 @@
-from typing import List
+import sys
+from typing import List, Optional, Tuple, Union
 
 
 class NewMessage:
@@ -18,21 +19,40 @@ class Update:
     Describes an update sent by Tinder containing information about new matches and messages.
     """
 
-    __slots__ = ["new_matches", "new_messages", "update"]
+    __slots__ = ["new_matches", "new_messages", "last_activity_date", "update"]
 
-    def __init__(self, update: dict):
-        self.new_matches: List[str] = []
-        """A list of all new matches"""
-        self.new_messages: List[NewMessage] = []
-        """A list of all new messages"""
+    def __init__(self, update: dict, slim: bool = False):
+        """
+        Creates a new update.
+
+        :param update: the raw `/updates` response
+        :param slim: keeps only the ids of new matches and messages in tuples and drops the raw
+        response. Use it for long-running poll loops
+        """
+
+        new_matches: List[str] = []
+        new_messages: List[NewMessage] = []
         for match in update["matches"]:
             seen = True
             if "seen" in match:
                 seen = match["seen"]["match_seen"]
             if seen:
                 for message in match["messages"]:
-                    self.new_messages.append(NewMessage(message["_id"], message["match_id"]))
+                    match_id = message["match_id"]
+                    if slim:
+                        match_id = sys.intern(match_id)
+                    new_messages.append(NewMessage(message["_id"], match_id))
             else:
-                self.new_matches.append(match["_id"])
-        self.update: dict = update
-        """The raw update event response"""
+                new_matches.append(sys.intern(match["_id"]) if slim else match["_id"])
+        self.new_matches: Union[List[str], Tuple[str, ...]] = new_matches
+        """A list of all new matches"""
+        self.new_messages: Union[List[NewMessage], Tuple[NewMessage, ...]] = new_messages
+        """A list of all new messages"""
+        self.last_activity_date: Optional[str] = update.get("last_activity_date")
+        """The date to request the next updates from"""
+        self.update: Optional[dict] = update
+        """The raw update event response, `None` in slim mode"""
+        if slim:
+            self.new_matches = tuple(new_matches)
+            self.new_messages = tuple(new_messages)
+            self.update = None
@@ -1,12 +1,18 @@
+import logging
+import threading
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Tuple, List, Union
 
 from tinder.entities.entity import Entity
+from tinder.entities.intern import build
 from tinder.entities.socials import InstagramInfo, FacebookInfo, SpotifyTrack, SpotifyTopArtist
 from tinder.entities.photo import GenericPhoto, SizedImage, MatchPhoto, ProfilePhoto
+from tinder.exceptions import TinderException
 from tinder.http import Http
 
+_logger = logging.getLogger("tinder-py")
+
 
 class Badge:
     """
@@ -45,7 +51,7 @@ class Descriptor:
         self.icon_url: str = descriptor["icon_url"]
         self.icon_urls: Tuple[SizedImage] = tuple(SizedImage(i) for i in descriptor["icon_urls"])
         if "choice_selection" in descriptor:
-            self.selection: ChoiceSelection = ChoiceSelection(descriptor["choice_selection"])
+            self.selection: ChoiceSelection = build(ChoiceSelection, descriptor["choice_selection"])
 
 
 class Gender(Enum):
@@ -154,7 +160,7 @@ class GenericUser(Entity):
         self.gender: Gender = Gender(user["gender"])
         self.badges: Tuple[Badge] = tuple()
         if "badges" in user:
-            self.badges: Tuple[Badge] = tuple(Badge(b) for b in user["badges"])
+            self.badges: Tuple[Badge] = tuple(build(Badge, b) for b in user["badges"])
         self.photos: Tuple[GenericPhoto] = tuple(GenericPhoto(p, http) for p in user["photos"])
         self.best_photo: GenericPhoto = max(self.photos, key=lambda photo: photo.score, default=None)
 
@@ -206,6 +212,7 @@ class SelfUser(GenericUser):
         "school",
         "show_gender_on_profile",
         "can_create_squad",
+        "_pending_edit",
     ]
 
     def __init__(self, user: dict, http: Http):
@@ -225,33 +232,47 @@ class SelfUser(GenericUser):
         self.photo_optimizer_enabled: bool = user["photo_optimizer_enabled"]
         self.last_online: str = user["ping_time"]
         self.position: Position = Position(user["pos"])
-        self.position_info: PositionInfo = PositionInfo(user["pos_info"])
+        self.position_info: PositionInfo = build(PositionInfo, user["pos_info"])
         if "schools" in user:
             self.school: School = School(user["schools"][0])
         self.show_gender_on_profile: bool = user["show_gender_on_profile"]
         self.can_create_squad: bool = user["can_create_squad"]
 
-    def update_interests(self, interests: Union[List[Interest], None]):
+    def edit(self, debounce: float = 0.0) -> "ProfileEdit":
         """
-        Update the profile interests. Pass <em>None<em> to delete the interests.
+        Starts a transaction that collects several profile changes and sends them with as few
+        requests as possible:
 
-        :param interests: the interests to update.
+        >>> with self_user.edit() as tx:
+        ...     tx.bio("Hello").gender(Gender.FEMALE, True).search_preferences(distance_filter=20)
+
+        With `debounce`, transactions started within `debounce` seconds of each other are merged
+        and sent together once no further edit happened for `debounce` seconds.
+
+        :param debounce: the seconds to wait for further edits before sending, default 0
+        :return: the transaction
         """
 
-        if interests is None:
-            self.http.make_request(method="DELETE", route="/v2/profile/userinterests")
-            return
+        return ProfileEdit(self, debounce)
 
-        if len(interests) > 5:
-            raise ValueError("You cannot select more than 5 interests!")
+    def flush_edits(self):
+        """
+        Sends debounced edits right away.
+        """
 
-        body = {"user": {"user_interests": {"selected_interests": []}}}
-        for interest in interests:
-            body["user"]["user_interests"]["selected_interests"].append(
-                {"id": interest.id, "name": interest.name}
-            )
+        pending = getattr(self, "_pending_edit", None)
+        if pending is not None and not pending.committed:
+            pending.commit()
+
+    def update_interests(self, interests: Union[List[Interest], None]):
+        """
+        Update the profile interests. Pass <em>None<em> to delete the interests.
+
+        :param interests: the interests to update.
+        """
 
-        self.http.make_request(method="POST", route="/v2/profile", body=body)
+        with self.edit() as tx:
+            tx.interests(interests)
 
     def update_descriptors(self, descriptors: dict):
         """
@@ -260,7 +281,8 @@ class SelfUser(GenericUser):
         :param descriptors: the interests to update.
         """
 
-        self.http.make_request(method="POST", route="/v2/profile", body=descriptors)
+        with self.edit() as tx:
+            tx.descriptors(descriptors)
 
     def update_job(self, job: Union[Job, None]):
         """
@@ -269,21 +291,8 @@ class SelfUser(GenericUser):
         :param job: the new job
         """
 
-        body = {
-            "jobs": [
-                {
-                    "company": {"displayed": True, "name": ""},
-                    "title": {"displayed": True, "name": ""},
-                },
-            ]
-        }
-        if job is not None:
-            body["jobs"][0]["company"]["name"] = job.company
-            body["jobs"][0]["title"]["name"] = job.title
-
-        self.http.make_request(method="POST", route="/v2/profile/job", body=body)
-
-        self.job = job
+        with self.edit() as tx:
+            tx.job(job)
 
     def update_bio(self, bio: str):
         """
@@ -292,9 +301,8 @@ class SelfUser(GenericUser):
         :param bio: the new bio
         """
 
-        self.http.make_request(method="POST", route="/v2/profile", body={"user": {"bio": bio}})
-
-        self.bio = bio
+        with self.edit() as tx:
+            tx.bio(bio)
 
     def update_school(self, school: str):
         """
@@ -303,13 +311,8 @@ class SelfUser(GenericUser):
         :param school: the new school
         """
 
-        body = {"schools": []}
-        if school != "":
-            body["schools"] = {"displayed": True, "name": school}
-
-        self.http.make_request(method="POST", route="/v2/profile/school", body=body)
-
-        self.school = school
+        with self.edit() as tx:
+            tx.school(school)
 
     def update_city(self, city: Union[dict, None]):
         """
@@ -318,10 +321,8 @@ class SelfUser(GenericUser):
         :param city: the new city
         """
 
-        if city is None:
-            self.http.make_request(method="DELETE", route="/v2/profile/city")
-        else:
-            self.http.make_request(method="POST", route="/v2/profile/city", body=city)
+        with self.edit() as tx:
+            tx.city(city)
 
     def update_gender(self, gender: Gender, show_gender: bool):
         """
@@ -332,13 +333,8 @@ class SelfUser(GenericUser):
         :return:
         """
 
-        self.http.make_request(
-            method="POST",
-            route="/v2/profile",
-            body={"user": {"show_gender_on_profile": show_gender, "gender": gender}},
-        )
-
-        self.gender = gender
+        with self.edit() as tx:
+            tx.gender(gender, show_gender)
 
     def update_search_preferences(self, **kwargs):
         """
@@ -348,13 +344,202 @@ class SelfUser(GenericUser):
         :param kwargs: search preferences to update
         """
 
-        body = {"user": {}}
-        for key, value in kwargs:
-            body["user"][key] = value
-        self.http.make_request(method="POST", route="/v2/profile", body=body)
+        with self.edit() as tx:
+            tx.search_preferences(**kwargs)
+
 
-        for key, value in kwargs:
-            self.__setattr__(key, value)
+_edit_lock = threading.Lock()
+
+
+def _merge(target: dict, source: dict):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class ProfileEdit:
+    """
+    A batch of profile changes, see `SelfUser.edit`. All changes to `/v2/profile` are merged into
+    a single request. Changes are staged until the `with` block ends without an exception. The
+    local `SelfUser` is updated with every request that succeeded; the failed ones are kept, so
+    `commit` can be called again.
+    """
+
+    _interests_route = "/v2/profile/userinterests"
+
+    def __init__(self, user: SelfUser, debounce: float = 0.0):
+        self._user = user
+        self._debounce = debounce
+        self._profile: dict = {}
+        self._profile_local: dict = {}
+        self._requests: dict = {}
+        """The body and the local changes per method and route"""
+        self._timer = None
+        self._lock = threading.RLock()
+        self.committed: bool = False
+
+    def _update_profile(self, body: dict, **local) -> "ProfileEdit":
+        with self._lock:
+            if "user_interests" in body.get("user", {}):
+                self._requests.pop(("DELETE", self._interests_route), None)
+            _merge(self._profile, body)
+            self._profile_local.update(local)
+        return self
+
+    def _request(self, method: str, route: str, body=None, **local) -> "ProfileEdit":
+        with self._lock:
+            # a later change of the same resource replaces the earlier one
+            for key in [k for k in self._requests if k[1] == route]:
+                del self._requests[key]
+            if route == self._interests_route:
+                self._profile.get("user", {}).pop("user_interests", None)
+            self._requests[(method, route)] = (body, local)
+        return self
+
+    def bio(self, bio: str) -> "ProfileEdit":
+        return self._update_profile({"user": {"bio": bio}}, bio=bio)
+
+    def interests(self, interests: Union[List[Interest], None]) -> "ProfileEdit":
+        if interests is None:
+            return self._request("DELETE", self._interests_route)
+        if len(interests) > 5:
+            raise ValueError("You cannot select more than 5 interests!")
+        selected = [{"id": interest.id, "name": interest.name} for interest in interests]
+        return self._update_profile({"user": {"user_interests": {"selected_interests": selected}}})
+
+    def descriptors(self, descriptors: dict) -> "ProfileEdit":
+        return self._update_profile(descriptors)
+
+    def gender(self, gender: Gender, show_gender: bool) -> "ProfileEdit":
+        return self._update_profile(
+            {"user": {"show_gender_on_profile": show_gender, "gender": Gender(gender).value}},
+            gender=Gender(gender),
+            show_gender_on_profile=show_gender,
+        )
+
+    def search_preferences(self, **kwargs) -> "ProfileEdit":
+        body = {}
+        local = {}
+        for key, value in kwargs.items():
+            if key in ("gender_filter", "gender"):
+                value = Gender(value)
+                body[key] = value.value
+            else:
+                body[key] = value
+            local[key] = value
+        return self._update_profile({"user": body}, **local)
+
+    def job(self, job: Union[Job, None]) -> "ProfileEdit":
+        body = {
+            "jobs": [
+                {
+                    "company": {"displayed": True, "name": ""},
+                    "title": {"displayed": True, "name": ""},
+                },
+            ]
+        }
+        if job is not None:
+            body["jobs"][0]["company"]["name"] = job.company
+            body["jobs"][0]["title"]["name"] = job.title
+        return self._request("POST", "/v2/profile/job", body, job=job)
+
+    def school(self, school: str) -> "ProfileEdit":
+        body = {"schools": []}
+        if school != "":
+            body["schools"] = {"displayed": True, "name": school}
+        return self._request("POST", "/v2/profile/school", body, school=school)
+
+    def city(self, city: Union[dict, None]) -> "ProfileEdit":
+        if city is None:
+            return self._request("DELETE", "/v2/profile/city")
+        return self._request("POST", "/v2/profile/city", city)
+
+    def commit(self):
+        """
+        Sends all collected changes and applies them to the local user. Called automatically at
+        the end of the `with` block. If a request fails, the changes that were sent already are
+        applied and the remaining ones are sent by the next call. Pending debounced changes are
+        sent along, so they cannot overwrite these ones afterwards.
+        """
+
+        with _edit_lock:
+            pending = getattr(self._user, "_pending_edit", None)
+        if pending is not None and pending is not self and pending._absorb(self, schedule=False):
+            # the changes were handed over, they are sent after the debounced ones and win
+            self._profile, self._profile_local, self._requests = {}, {}, {}
+            self.committed = True
+            pending._send()
+            return
+        self._send()
+
+    def _send(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.committed:
+                return
+            http = self._user.http
+            if self._profile:
+                http.make_request(method="POST", route="/v2/profile", body=self._profile)
+                self._apply(self._profile_local)
+                self._profile = {}
+                self._profile_local = {}
+            for (method, route), (body, local) in list(self._requests.items()):
+                http.make_request(method=method, route=route, body=body)
+                self._apply(local)
+                del self._requests[(method, route)]
+            self.committed = True
+
+    def _apply(self, local: dict):
+        for key, value in local.items():
+            setattr(self._user, key, value)
+
+    def _absorb(self, edit: "ProfileEdit", schedule: bool = True) -> bool:
+        # adds the changes of a finished block on top of the pending ones
+        with self._lock:
+            if self.committed:
+                return False
+            for (method, route), (body, local) in edit._requests.items():
+                self._request(method, route, body, **local)
+            self._update_profile(edit._profile, **edit._profile_local)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not schedule:
+                return True
+            self._timer = threading.Timer(self._debounce, self._commit_debounced)
+            self._timer.daemon = True
+            self._timer.start()
+            return True
+
+    def _commit_debounced(self):
+        try:
+            self.commit()
+        except Exception as error:
+            _logger.error(
+                f"Failed to apply debounced profile edits, they are sent with the next edit or "
+                f"flush_edits: {error!r}"
+            )
+
+    def __enter__(self) -> "ProfileEdit":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            # the staged changes of a failed block are discarded
+            return
+        if self._debounce <= 0:
+            self.commit()
+            return
+        with _edit_lock:
+            pending = getattr(self._user, "_pending_edit", None)
+            if pending is None or not pending._absorb(self):
+                pending = ProfileEdit(self._user, self._debounce)
+                pending._absorb(self)
+                self._user._pending_edit = pending
 
 
 class MatchedUser(GenericUser):
@@ -407,24 +592,26 @@ class SwipeableUser(GenericUser):
         "theme_track",
     ]
 
-    def __init__(self, user: dict, http: Http):
+    def __init__(self, user: dict, http: Http, like: dict = None):
         super().__init__(user, http)
+        # distance, s_number and teasers belong to the like around the profile, if there is one
+        like = user if like is None else like
         self.job: Job = Job(user["jobs"])
         if len(user["schools"]) > 0:
             self.school: School = School(user["schools"][0])
         if "city" in user:
             self.city: str = user["city"]["name"]
-        self._distance: int = user["distance_mi"]
-        self.s_number: int = user["s_number"]
-        self.teasers: Tuple[Teaser] = tuple(Teaser(t) for t in user["teasers"])
+        self._distance: int = like["distance_mi"]
+        self.s_number: int = like["s_number"]
+        self.teasers: Tuple[Teaser] = tuple(Teaser(t) for t in like["teasers"])
         self.facebook: FacebookInfo = FacebookInfo(user)
         if "user_interests" in user:
             self.interests: Tuple[Interest] = tuple(
-                Interest(i) for i in user["user_interests"]["selected_interests"]
+                build(Interest, i) for i in user["user_interests"]["selected_interests"]
             )
         if "selected_descriptors" in user:
             self.descriptors: Tuple[Descriptor] = tuple(
-                Descriptor(d) for d in user["selected_descriptors"]
+                build(Descriptor, d) for d in user["selected_descriptors"]
             )
         self.show_gender_on_profile: bool = True
         if "show_gender_on_profile" in user:
@@ -436,6 +623,16 @@ class SwipeableUser(GenericUser):
         if "spotify_theme_track" in user:
             self.theme_track: SpotifyTrack = SpotifyTrack(user["spotify_theme_track"])
 
+    def refresh(self, user: dict):
+        """
+        Updates the fields that change between fetches while the content hash stays the same.
+
+        :param user: the raw user of the latest fetch
+        """
+
+        self._distance = user["distance_mi"]
+        self.s_number = user["s_number"]
+
     @property
     def distance_mi(self) -> int:
         return self._distance
@@ -462,11 +659,25 @@ class LikedUser(SwipeableUser):
     __slots__ = ["content_hash", "has_been_superliked", "expire_time"]
 
     def __init__(self, user: dict, http: Http):
-        super().__init__(user, http)
+        """
+        Creates a new liked user.
+
+        :param user: the raw `/v2/my-likes` result. The profile is read from its `user` object
+        and the like fields, e.g. `distance_mi`, from the result itself. A flat dict of both is
+        accepted as well
+        :param http: the http handle
+        """
+
+        super().__init__(user.get("user", user), http, user)
         self.content_hash: str = user["content_hash"]
         self.has_been_superliked: str = user["has_been_superliked"]
         self.expire_time: datetime = datetime.fromtimestamp(user["expire_time"] / 1000)
 
+    def refresh(self, user: dict):
+        super().refresh(user)
+        self.has_been_superliked = user["has_been_superliked"]
+        self.expire_time = datetime.fromtimestamp(user["expire_time"] / 1000)
+
 
 class UserProfile(SwipeableUser):
     """
@@ -515,6 +726,10 @@ class Recommendation(SwipeableUser):
         self.group_matched: bool = user["group_matched"]
         self.content_hash: str = user["content_hash"]
 
+    def refresh(self, user: dict):
+        super().refresh(user)
+        self.group_matched = user["group_matched"]
+
 
 class LikePreview(Entity):
     """
@@ -21,3 +21,15 @@ class NotFound(TinderException):
 
 class RequestFailed(TinderException):
     pass
+
+
+class CircuitOpen(RequestFailed):
+    pass
+
+
+class DeadlineExceeded(TinderException):
+    pass
+
+
+class Cancelled(TinderException):
+    pass
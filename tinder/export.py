@@ -0,0 +1,343 @@
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from tinder.entities.dates import parse_date
+from tinder.entities.match import Match
+from tinder.entities.message import Message
+from tinder.entities.user import SwipeableUser
+
+match_fields: Dict[str, str] = {
+    "id": "str",
+    "created_date": "timestamp",
+    "last_activity_date": "timestamp",
+    "closed": "bool",
+    "dead": "bool",
+    "pending": "bool",
+    "is_super_like": "bool",
+    "is_boost_match": "bool",
+    "is_fast_match": "bool",
+    "is_opener": "bool",
+    "seen": "bool",
+    "user_id": "str",
+    "user_name": "str",
+    "user_age": "int",
+    "user_gender": "str",
+    "user_bio": "str",
+    "photo_count": "int",
+}
+"""The exported columns of matches and their types"""
+
+message_fields: Dict[str, str] = {
+    "id": "str",
+    "match_id": "str",
+    "sent_date": "timestamp",
+    "author_id": "str",
+    "recipient_id": "str",
+    "content": "str",
+    "attachment_type": "str",
+}
+"""The exported columns of messages and their types"""
+
+user_fields: Dict[str, str] = {
+    "id": "str",
+    "name": "str",
+    "age": "int",
+    "gender": "str",
+    "bio": "str",
+    "city": "str",
+    "distance_km": "float",
+    "photo_count": "int",
+    "interests": "str",
+}
+"""The exported columns of users and their types"""
+
+
+def format_date(value: Optional[datetime]) -> Optional[str]:
+    """
+    Formats a date the way the API does.
+
+    :param value: the date
+    :return: the ISO 8601 string with milliseconds
+    """
+
+    if value is None:
+        return None
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def match_record(match: Match) -> dict:
+    """
+    Gets the exported columns of a match.
+
+    :param match: the match
+    :return: the record
+    """
+
+    user = match.matched_user
+    return {
+        "id": match.id,
+        "created_date": parse_date(match.created_date),
+        "last_activity_date": parse_date(match.last_activity_date),
+        "closed": match.closed,
+        "dead": match.dead,
+        "pending": match.pending,
+        "is_super_like": match.is_super_like,
+        "is_boost_match": match.is_boost_match,
+        "is_fast_match": match.is_fast_match,
+        "is_opener": match.is_opener,
+        "seen": match.seen,
+        "user_id": user.id,
+        "user_name": user.name,
+        "user_age": user.age,
+        "user_gender": user.gender.name,
+        "user_bio": user.bio,
+        "photo_count": len(user.photos),
+    }
+
+
+def message_record(message: Message) -> dict:
+    """
+    Gets the exported columns of a message.
+
+    :param message: the message
+    :return: the record
+    """
+
+    return {
+        "id": message.id,
+        "match_id": message.match_id,
+        "sent_date": parse_date(message.sent_date),
+        "author_id": message.author_id,
+        "recipient_id": message.recipient_id,
+        "content": message.content,
+        "attachment_type": message.attachment_type.name,
+    }
+
+
+def user_record(user: SwipeableUser) -> dict:
+    """
+    Gets the exported columns of a recommendation, liked user or user profile.
+
+    :param user: the user
+    :return: the record
+    """
+
+    return {
+        "id": user.id,
+        "name": user.name,
+        "age": user.age,
+        "gender": user.gender.name,
+        "bio": user.bio,
+        "city": getattr(user, "city", None),
+        "distance_km": round(user.distance_km, 1),
+        "photo_count": len(user.photos),
+        "interests": ",".join(i.name for i in getattr(user, "interests", ())),
+    }
+
+
+class ChunkedWriter:
+    """
+    ABC for export writers. Records are buffered and written in chunks, so the memory use only
+    depends on the chunk size. Paths ending with `.gz` are compressed.
+    """
+
+    def __init__(
+        self, path: str, fields: Dict[str, str], chunk_size: int = 1000, append: bool = False
+    ):
+        """
+        Creates a new writer.
+
+        :param path: the file to write to
+        :param fields: the columns and their types (`str`, `int`, `float`, `bool` or
+        `timestamp`), in order
+        :param chunk_size: the amount of records to buffer before writing
+        :param append: append to an existing file instead of replacing it
+        """
+
+        self.path: str = path
+        self.fields: Dict[str, str] = fields
+        self.chunk_size: int = chunk_size
+        self.append: bool = append
+        self.written: int = 0
+        self._chunk: List[dict] = []
+        self._file = None
+
+    def _open(self):
+        mode = "a" if self.append else "w"
+        self._new = not (self.append and os.path.exists(self.path) and os.path.getsize(self.path))
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8", newline="")
+        return open(self.path, mode, encoding="utf-8", newline="")
+
+    def write(self, record: dict):
+        self._chunk.append(record)
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, records: Iterable[dict]) -> int:
+        """
+        Writes all records.
+
+        :param records: the records
+        :return: the total amount of written records
+        """
+
+        for record in records:
+            self.write(record)
+        self.flush()
+        return self.written
+
+    def flush(self):
+        if self._file is None:
+            self._file = self._open()
+            self._start()
+        if self._chunk:
+            self._write_chunk(self._chunk)
+            self.written += len(self._chunk)
+            self._chunk = []
+            self._file.flush()
+
+    def _start(self):
+        pass
+
+    def _write_chunk(self, chunk: List[dict]):
+        raise NotImplementedError
+
+    def _columns(self, chunk: List[dict]) -> Dict[str, list]:
+        return {field: [record.get(field) for record in chunk] for field in self.fields}
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NdjsonWriter(ChunkedWriter):
+    """
+    Writes one json object per line. Dates are written as ISO 8601 strings.
+    """
+
+    def _write_chunk(self, chunk: List[dict]):
+        dates = [field for field, kind in self.fields.items() if kind == "timestamp"]
+        buffer = io.StringIO()
+        for record in chunk:
+            row = {field: record.get(field) for field in self.fields}
+            for field in dates:
+                row[field] = format_date(row[field])
+            json.dump(row, buffer, default=str)
+            buffer.write("\n")
+        self._file.write(buffer.getvalue())
+
+
+class CsvWriter(ChunkedWriter):
+    """
+    Writes comma separated values with a header row. Dates are written as ISO 8601 strings,
+    booleans as `1` and `0`.
+    """
+
+    def _start(self):
+        self._writer = csv.writer(self._file)
+        if self._new:
+            self._writer.writerow(self.fields)
+
+    def _write_chunk(self, chunk: List[dict]):
+        columns = []
+        for field, values in self._columns(chunk).items():
+            kind = self.fields[field]
+            if kind == "timestamp":
+                values = [format_date(value) for value in values]
+            elif kind == "bool":
+                values = [None if value is None else int(value) for value in values]
+            columns.append(values)
+        self._writer.writerows(zip(*columns))
+
+
+class ParquetWriter(ChunkedWriter):
+    """
+    Writes a Parquet file with one row group per chunk. Requires pyarrow. Booleans are stored
+    bit-packed and dates as UTC timestamps with millisecond precision.
+    """
+
+    def _open(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("The Parquet export requires pyarrow!") from error
+        if self.append:
+            raise ValueError("Parquet files cannot be appended to!")
+
+        types = {
+            "str": pyarrow.string(),
+            "int": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "bool": pyarrow.bool_(),
+            "timestamp": pyarrow.timestamp("ms", tz="UTC"),
+        }
+        self._schema = pyarrow.schema([(field, types[kind]) for field, kind in self.fields.items()])
+        self._pyarrow = pyarrow
+        return _ParquetFile(pyarrow.parquet.ParquetWriter(self.path, self._schema))
+
+    def _write_chunk(self, chunk: List[dict]):
+        table = self._pyarrow.Table.from_pydict(self._columns(chunk), schema=self._schema)
+        self._file.writer.write_table(table)
+
+
+class _ParquetFile:
+    __slots__ = ["writer"]
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def flush(self):
+        # every chunk is a complete row group, the footer is written on close
+        pass
+
+    def close(self):
+        self.writer.close()
+
+
+writers: Dict[str, Callable[..., ChunkedWriter]] = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+"""The writer per export format"""
+
+
+def open_writer(
+    path: str,
+    fields: Dict[str, str],
+    format: str = None,
+    chunk_size: int = 1000,
+    append: bool = False,
+) -> ChunkedWriter:
+    """
+    Creates a writer for an export format.
+
+    :param path: the file to write to
+    :param fields: the columns and their types, in order
+    :param format: the format, default guessed from the file extension
+    :param chunk_size: the amount of records to buffer before writing
+    :param append: append to an existing file instead of replacing it
+    :return: the writer
+    """
+
+    if format is None:
+        name = path[:-3] if path.endswith(".gz") else path
+        format = name.rsplit(".", 1)[-1] if "." in name else "ndjson"
+        if format == "jsonl":
+            format = "ndjson"
+    if format not in writers:
+        raise ValueError(f"Unknown export format {format}, expected one of {', '.join(writers)}!")
+    return writers[format](path, fields, chunk_size, append)
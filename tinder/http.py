@@ -1,11 +1,44 @@
 import logging
+import re
+import threading
 import time
 from math import floor
 from random import random
+from typing import Callable, Tuple, TypeVar
 
-import requests
+from tinder.cache import CachedResponse, ResponseCache
+from tinder.cassette import RecordingTransport, ReplayTransport
+from tinder.circuit import CircuitBreakers
+from tinder.deadline import Deadline, current_deadline
+from tinder.exceptions import (
+    Unauthorized,
+    Forbidden,
+    NotFound,
+    RequestFailed,
+    CircuitOpen,
+    DeadlineExceeded,
+)
+from tinder.metrics import Metrics
+from tinder.ratelimit import RateControllers, account_key, parse_retry_after
+from tinder.streaming import JsonArrayStream
+from tinder.transport import RequestsTransport, Response, Transport
 
-from tinder.exceptions import Unauthorized, Forbidden, NotFound, RequestFailed
+T = TypeVar("T")
+
+_id_segment = re.compile(r"^(?=.*\d)[0-9a-zA-Z_-]{8,}$|^\d+$")
+
+
+def route_template(route: str) -> str:
+    """
+    Gets the template of a route by dropping the query and replacing ids with `{id}`, e.g.
+    `/v2/matches/{id}/messages` for `/v2/matches/5f3a.../messages?count=60`.
+
+    :param route: the route
+    :return: the route template
+    """
+
+    path = route.split("?", 1)[0]
+    return "/".join("{id}" if _id_segment.match(s) else s for s in path.split("/"))
 
 
 class Http:
@@ -16,14 +49,41 @@ class Http:
         "Content-Type": "application/json",
         "X-Auth-Token": "",
     }
-    _reattempt_count = {}
     _request_count = 0
     _logger = logging.getLogger("tinder-py")
 
-    def __init__(self, token: str, log_level: int, timeout_factor: int = 10):
+    def __init__(
+        self,
+        token: str,
+        log_level: int,
+        timeout_factor: int = 10,
+        response_cache_size: int = 16 * 1024 * 1024,
+        transport: Transport = None,
+        circuit_breakers: CircuitBreakers = None,
+        request_timeout: float = 30.0,
+        rate_controllers: RateControllers = None,
+        base_url: str = None,
+    ):
+        self._headers = dict(self._headers)
+        if base_url:
+            self._base_url = base_url.rstrip("/")
         self._headers["X-Auth-Token"] = token
+        self._transport = transport
+        self.metrics = Metrics()
+        if circuit_breakers is None:
+            circuit_breakers = CircuitBreakers()
+        if circuit_breakers.metrics is None:
+            circuit_breakers.metrics = self.metrics
+        self.circuit_breakers = circuit_breakers
+        if rate_controllers is not None and rate_controllers.metrics is None:
+            rate_controllers.metrics = self.metrics
+        self.rate_controllers = rate_controllers
+        self.account = account_key(token)
         self._max_reattempts = 3
         self._timeout = timeout_factor
+        self.request_timeout: float = request_timeout
+        self._limiter_lock = threading.Lock()
+        self.response_cache = ResponseCache(response_cache_size) if response_cache_size else None
         logging.basicConfig(level=log_level)
         logging.getLogger("urllib3").setLevel(logging.WARNING)
         if timeout_factor < 1:
@@ -32,36 +92,84 @@ class Http:
                 "This might result in API spam and banned accounts!"
             )
 
-    def make_request(self, **kwargs) -> requests.Response:
+    @property
+    def transport(self) -> Transport:
+        if self._transport is None:
+            # created on first use, so requests is only imported once it is needed
+            self._transport = RequestsTransport()
+        return self._transport
+
+    def record(self, path: str):
+        """
+        Records all following requests and responses to a gzipped NDJSON cassette. The auth
+        token is scrubbed.
+
+        :param path: the cassette file
+        """
+
+        self._transport = RecordingTransport(self.transport, path, self._headers["X-Auth-Token"])
+
+    def stop_recording(self):
+        """
+        Finishes the cassette started by `record` and sends the following requests without
+        recording them.
+        """
+
+        if isinstance(self._transport, RecordingTransport):
+            self._transport = self._transport.stop()
+
+    def replay(self, path: str, emulate_timing: float = 0.0):
+        """
+        Serves all following requests from a cassette instead of the Tinder API.
+
+        :param path: the cassette file
+        :param emulate_timing: sleeps for the recorded duration multiplied by this factor
+        """
+
+        self._transport = ReplayTransport(path, emulate_timing)
+
+    def close(self):
+        """
+        Closes the transport and finishes a cassette that is being recorded.
+        """
+
+        if self._transport is not None:
+            self._transport.close()
+
+    def make_request(self, **kwargs) -> Response:
+        """
+        Sends a request. Unless a `deadline` is passed or the call runs inside a
+        `with Deadline(...)` block, the request including retries and rate limit waits has to
+        finish within `request_timeout` seconds. Pass `retry=False` to raise on server errors
+        instead of retrying, e.g. for requests that must not be sent twice.
+        """
+
+        deadline = kwargs.get("deadline") or current_deadline()
+        if deadline is None:
+            deadline = Deadline(self.request_timeout)
+        kwargs["deadline"] = deadline
+        deadline.check()
+
         route = kwargs.get("route")
         method = kwargs.get("method")
         body = kwargs.get("body")
+        headers = self._headers
+        if kwargs.get("headers"):
+            headers = {**self._headers, **kwargs["headers"]}
+        attempt = kwargs.get("attempt", 1)
+        template = route_template(route)
 
-        self._request_count += 1
-
-        if self._request_count > 2:
-            timeout = floor(self._timeout * random())
-            self._logger.debug(f"Too many requests. Waiting for {timeout} secs")
-            time.sleep(timeout)
-            self._request_count = 0
-            self._logger.debug("Continuing...")
-
-        url = self._base_url + route
-        self._logger.debug(f"Sending {method} request to {url}")
-        if method == "GET":
-            response = requests.get(url, headers=self._headers)
-        elif method == "POST":
-            response = requests.post(url, headers=self._headers, json=body)
-        elif method == "PUT":
-            response = requests.put(url, headers=self._headers, json=body)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=self._headers)
-        else:
+        if method not in ("GET", "DELETE", "POST", "PUT"):
             raise ValueError("Invalid request method!")
+        if not self.circuit_breakers.allow(template):
+            self.metrics.increment(f"rejected.{template}")
+            raise CircuitOpen(f"The circuit for {template} is open, failing fast.")
+
+        stream = kwargs.get("stream", False)
+        response = self._send(method, route, template, headers, body, deadline, stream)
         status = response.status_code
-        self._logger.debug(f"Got response: {status}")
 
-        if 200 <= status < 300:
+        if 200 <= status < 300 or status == 304:
             return response
 
         elif 400 <= status < 500:
@@ -72,31 +180,156 @@ class Http:
             elif status == 404:
                 raise NotFound(response)
             elif status == 429:
-                timeout = floor(self._timeout * random())
-                self._logger.debug(f"Too many requests. Waiting for {timeout} secs")
-                time.sleep(timeout)
+                if self.rate_controllers is None:
+                    timeout = floor(self._timeout * random())
+                    self._logger.debug(f"Too many requests. Waiting for {timeout} secs")
+                    deadline.sleep(timeout)
+                # otherwise the controller lowered the rate and waits for Retry-After
                 self._logger.debug("Reattempting...")
-                self.make_request(route=route, method=method, body=body)
+                return self.make_request(**kwargs)
             else:
                 raise RequestFailed(response)
 
         else:
-            if url.__hash__() in self._reattempt_count:
-                self._reattempt_count[url.__hash__()] += 1
-            else:
-                self._reattempt_count[url.__hash__()] = 1
-
-            if self._reattempt_count[url.__hash__()] < self._max_reattempts:
+            breaker = self.circuit_breakers.get(template)
+            if breaker.retry_in() > 0:
+                self._logger.error(
+                    f"Something went wrong. Status Code {status}. "
+                    f"Opened the circuit for {template}."
+                )
+                raise RequestFailed(response)
+            elif attempt < self._max_reattempts and kwargs.get("retry", True):
                 self._logger.warning(
                     f"Something went wrong. Status Code {status}. "
-                    f"Reattempting Request "
-                    f"{self._reattempt_count[url.__hash__()]}..."
+                    f"Reattempting Request {attempt}..."
                 )
-                self.make_request(route=route, method=method, body=body)
+                return self.make_request(**{**kwargs, "attempt": attempt + 1})
             else:
-                self._logger.error(
-                    f"Something went wrong. Status Code {status}. Exceeded max retries."
-                )
+                reason = "Exceeded max retries" if kwargs.get("retry", True) else "Not retrying"
+                self._logger.error(f"Something went wrong. Status Code {status}. {reason}.")
                 raise RequestFailed(response)
 
-        self._request_count = 0
+    def _send(
+        self,
+        method: str,
+        route: str,
+        template: str,
+        headers: dict,
+        body,
+        deadline: Deadline,
+        stream: bool,
+    ) -> Response:
+        # sends a request the circuit allowed and records its outcome in the circuit
+        local = self.transport.local
+        controllers = None if local else self.rate_controllers
+        try:
+            if not local:
+                self._wait(deadline)
+            if controllers is not None:
+                sent_at = controllers.acquire(self.account, template, deadline)
+        except BaseException:
+            # a probe of a half-open circuit that was never sent must free its slot
+            self.circuit_breakers.release(template)
+            raise
+
+        url = self._base_url + route
+        self._logger.debug(f"Sending {method} request to {url}")
+        if method in ("GET", "DELETE"):
+            body = None
+        start = time.monotonic()
+        try:
+            args = (method, url, headers, body, deadline.timeout(self.request_timeout))
+            if stream:
+                response = self.transport.request(*args, stream=True)
+            else:
+                response = self.transport.request(*args)
+            if stream and not 200 <= response.status_code < 300:
+                # error bodies are small, read them to release the connection before retrying
+                response.read()
+        except Exception as error:
+            if controllers is not None:
+                controllers.release(self.account, template, sent_at)
+            # refused connections and timeouts count towards opening the circuit
+            self.circuit_breakers.record_failure(template)
+            self.metrics.increment(f"errors.{method} {template}")
+            if deadline.expired:
+                raise DeadlineExceeded(f"The deadline was exceeded by {method} {url}.") from error
+            raise
+        status = response.status_code
+        latency = time.monotonic() - start
+        self._logger.debug(f"Got response: {status}")
+        if controllers is not None:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            controllers.release(self.account, template, sent_at, status, latency, retry_after)
+        self.metrics.observe(f"latency.{method} {template}", latency)
+        self.metrics.increment(f"requests.{method} {template}")
+        self.metrics.increment(f"status.{status}")
+
+        if status < 500:
+            self.circuit_breakers.record_success(template)
+        else:
+            self.circuit_breakers.record_failure(template)
+        return response
+
+    def _wait(self, deadline: Deadline):
+        # the fixed limiter, used without rate controllers
+        if self.rate_controllers is not None:
+            return
+        with self._limiter_lock:
+            self._request_count += 1
+            wait = self._request_count > 2
+            if wait:
+                self._request_count = 0
+
+        # sleeping outside of the lock lets the other threads count their requests meanwhile
+        if wait:
+            timeout = floor(self._timeout * random())
+            self._logger.debug(f"Too many requests. Waiting for {timeout} secs")
+            deadline.sleep(timeout)
+            self._logger.debug("Continuing...")
+
+    def stream_items(self, path: Tuple[str, ...], **kwargs) -> JsonArrayStream:
+        """
+        Sends a request and iterates the items of an array inside the response while it is
+        still being received. The other values along the path, e.g. `next_page_token`, are
+        available in `siblings` once the array was iterated.
+
+        :param path: the keys leading to the array, e.g. `("data", "matches")`
+        :param kwargs: the arguments of `make_request`
+        :return: the items of the array
+        """
+
+        response = self.make_request(stream=True, **kwargs)
+        return JsonArrayStream(response.iter_content(), path)
+
+    def get_cached(self, route: str, parse: Callable[[dict], T]) -> T:
+        """
+        Sends a conditional GET request. If the server answers with <em>304 Not Modified</em>, the
+        previously parsed entity is returned without downloading or parsing the payload again.
+
+        :param route: the route to request
+        :param parse: builds the entity from the decoded response
+        :return: the parsed entity
+        """
+
+        if self.response_cache is None:
+            return parse(self.make_request(method="GET", route=route).json())
+
+        cached = self.response_cache.get(route)
+        headers = cached.validators() if cached is not None else None
+        response = self.make_request(method="GET", route=route, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.hits += 1
+            return cached.entity
+
+        self.response_cache.misses += 1
+        entity = parse(response.json())
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag is not None or last_modified is not None:
+            self.response_cache.put(
+                route, CachedResponse(etag, last_modified, entity, len(response.content))
+            )
+        else:
+            self.response_cache.invalidate(route)
+        return entity
@@ -0,0 +1,83 @@
+import json
+import threading
+from typing import Dict
+
+
+class Timing:
+    """
+    Aggregated durations of an operation.
+    """
+
+    __slots__ = ["count", "total", "max"]
+
+    def __init__(self):
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe counters, gauges and timings, e.g. of the requests sent by `Http`.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Timing] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = Timing()
+            timing.count += 1
+            timing.total += seconds
+            timing.max = max(timing.max, seconds)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def gauge(self, name: str, default: float = 0.0) -> float:
+        return self._gauges.get(name, default)
+
+    def snapshot(self) -> dict:
+        """
+        Gets a copy of all metrics.
+
+        :return: a dict with `counters`, `gauges` and `timings`
+        """
+
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {name: timing.as_dict() for name, timing in self._timings.items()},
+            }
+
+    def dump(self, path: str):
+        """
+        Writes a snapshot of all metrics to a json file.
+
+        :param path: the file to write to
+        """
+
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2, sort_keys=True)
@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, Iterable, List, Optional, Union
+
+from tinder.entities.dates import to_millis
+from tinder.entities.match import Match
+from tinder.exceptions import Forbidden, NotFound, Unauthorized
+
+_logger = logging.getLogger("tinder-py")
+
+_permanent = (Unauthorized, Forbidden, NotFound)
+"""Errors that fail a message instead of retrying it"""
+
+_clock_skew = 60000
+"""Milliseconds a message in the history may predate the first send attempt, for differing clocks"""
+
+
+class OutboxMessage:
+    """
+    A queued message and its delivery state.
+    """
+
+    __slots__ = [
+        "key",
+        "match_id",
+        "content",
+        "queued_at",
+        "state",
+        "attempted",
+        "attempted_at",
+        "message_id",
+        "error",
+    ]
+
+    def __init__(self, key: str, match_id: str, content: str, queued_at: int):
+        self.key: str = key
+        """The idempotency key"""
+        self.match_id: str = match_id
+        self.content: str = content
+        self.queued_at: int = queued_at
+        self.state: str = "pending"
+        """`pending`, `sent` or `failed`"""
+        self.attempted: bool = False
+        """`true` if a request was sent whose outcome is unknown"""
+        self.attempted_at: Optional[int] = None
+        """The milliseconds since the epoch when the first request was sent"""
+        self.message_id: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def __str__(self):
+        return f"OutboxMessage({self.key}:{self.state})"
+
+
+class Delivery:
+    """
+    The delivery report of a match.
+    """
+
+    __slots__ = ["match_id", "message_ids", "failed", "pending", "error"]
+
+    def __init__(self, match_id: str):
+        self.match_id: str = match_id
+        self.message_ids: List[str] = []
+        """The ids of the sent messages, in order"""
+        self.failed: int = 0
+        self.pending: int = 0
+        """Messages not sent because an earlier message of the match failed"""
+        self.error: Optional[str] = None
+
+    @property
+    def delivered(self) -> bool:
+        return self.failed == 0 and self.pending == 0
+
+    def as_dict(self) -> dict:
+        return {
+            "sent": len(self.message_ids),
+            "failed": self.failed,
+            "pending": self.pending,
+            "error": self.error,
+        }
+
+    def __str__(self):
+        return f"Delivery({self.match_id}: {len(self.message_ids)} sent, {self.failed} failed)"
+
+
+class Outbox:
+    """
+    Sends queued messages to many matches concurrently while the messages of each match are sent
+    one after another, in queue order. Every message has an idempotency key; queueing a key
+    twice or resuming an outbox never sends a message twice.
+
+    With a journal, every state change is appended to an NDJSON file before it takes effect, so
+    an outbox created with the same journal after a crash resumes the pending messages. Messages
+    whose request was sent but not answered are looked up in the message history of the match
+    before they are sent again.
+    """
+
+    def __init__(self, client, journal: str = None, workers: int = 4, retries: int = 2):
+        """
+        Creates a new outbox.
+
+        :param client: the client to send messages with, its rate limits apply
+        :param journal: the NDJSON file to persist the outbox to, default in memory only
+        :param workers: the amount of matches to send to concurrently
+        :param retries: the attempts per message after a server or network error
+        """
+
+        self.client = client
+        self.journal: Optional[str] = journal
+        self.workers: int = workers
+        self.retries: int = retries
+        self._messages: Dict[str, OutboxMessage] = OrderedDict()
+        self._claimed: set = set()
+        """The ids of the sent messages, each one confirms a single queued message"""
+        self._self_id: Optional[str] = None
+        self._lock = threading.Lock()
+        if journal is not None and os.path.exists(journal):
+            self._replay(journal)
+
+    def queue(self, match: Union[Match, str], content: str, key: str = None) -> str:
+        """
+        Queues a message.
+
+        :param match: the match or its id
+        :param content: the text to send
+        :param key: the idempotency key, default a random key
+        :return: the idempotency key
+        """
+
+        match_id = match if isinstance(match, str) else match.id
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            if key not in self._messages:
+                message = OutboxMessage(key, match_id, content, int(time.time() * 1000))
+                fields = {"match_id": match_id, "content": content, "queued_at": message.queued_at}
+                self._log("queued", message, **fields)
+                self._messages[key] = message
+        return key
+
+    def broadcast(
+        self, matches: Iterable[Union[Match, str]], content: str, key: str = None
+    ) -> List[str]:
+        """
+        Queues the same message for several matches.
+
+        :param matches: the matches or their ids
+        :param content: the text to send
+        :param key: the idempotency key of the broadcast, the key of each message is
+        `<key>:<match id>`. Default a random key
+        :return: the idempotency keys
+        """
+
+        key = key or uuid.uuid4().hex
+        keys = []
+        for match in matches:
+            match_id = match if isinstance(match, str) else match.id
+            keys.append(self.queue(match_id, content, f"{key}:{match_id}"))
+        return keys
+
+    def pending(self) -> List[OutboxMessage]:
+        """
+        Gets the messages that were not sent yet.
+
+        :return: the pending messages in queue order
+        """
+
+        with self._lock:
+            return [m for m in self._messages.values() if m.state == "pending"]
+
+    def get(self, key: str) -> Optional[OutboxMessage]:
+        return self._messages.get(key)
+
+    def send(self) -> Dict[str, Delivery]:
+        """
+        Sends all pending messages.
+
+        :return: the delivery report per match id
+        """
+
+        by_match: Dict[str, List[OutboxMessage]] = OrderedDict()
+        for message in self.pending():
+            by_match.setdefault(message.match_id, []).append(message)
+        reports = {match_id: Delivery(match_id) for match_id in by_match}
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="tinder-outbox") as executor:
+            futures = [
+                executor.submit(copy_context().run, self._send_all, messages, reports[match_id])
+                for match_id, messages in by_match.items()
+            ]
+            for future in futures:
+                future.result()
+        return reports
+
+    def _send_all(self, messages: List[OutboxMessage], report: Delivery):
+        for index, message in enumerate(messages):
+            self._send(message)
+            if message.state == "sent":
+                report.message_ids.append(message.message_id)
+                continue
+            # later messages of the match wait, so the match never receives them out of order
+            report.error = message.error
+            if message.state == "failed":
+                report.failed += 1
+                report.pending = len(messages) - index - 1
+            else:
+                report.pending = len(messages) - index
+            return
+
+    def _send(self, message: OutboxMessage):
+        for _ in range(self.retries + 1):
+            if message.attempted and self._delivered(message):
+                return
+            with self._lock:
+                if message.attempted_at is None:
+                    message.attempted_at = int(time.time() * 1000)
+                self._log("sending", message, at=message.attempted_at)
+                message.attempted = True
+            try:
+                sent = self.client.send_message(message.match_id, message.content, retry=False)
+            except _permanent as error:
+                with self._lock:
+                    message.state = "failed"
+                    message.error = repr(error)
+                    self._log("failed", message, error=message.error)
+                return
+            except Exception as error:
+                message.error = repr(error)
+                _logger.warning(f"Sending {message.key} failed: {message.error}")
+                continue
+            self._mark_sent(message, sent.id)
+            return
+
+    def _delivered(self, message: OutboxMessage) -> bool:
+        try:
+            if self._self_id is None:
+                self._self_id = self.client.get_self_user().id
+            history = self.client.get_recent_messages(message.match_id)
+        except Exception as error:
+            message.error = repr(error)
+            return False
+        since = (message.attempted_at or message.queued_at) - _clock_skew
+        for sent in history:
+            if (
+                sent.author_id == self._self_id
+                and sent.content == message.content
+                and to_millis(sent.sent_date) >= since
+            ):
+                with self._lock:
+                    if sent.id in self._claimed:
+                        # an earlier message of the outbox with the same text
+                        continue
+                self._mark_sent(message, sent.id)
+                return True
+        return False
+
+    def _mark_sent(self, message: OutboxMessage, message_id: str):
+        with self._lock:
+            message.state = "sent"
+            message.message_id = message_id
+            message.error = None
+            self._claimed.add(message_id)
+            self._log("sent", message, message_id=message_id)
+
+    def _log(self, event: str, message: OutboxMessage, **fields):
+        if self.journal is None:
+            return
+        line = json.dumps({"event": event, "key": message.key, **fields})
+        with open(self.journal, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _replay(self, journal: str):
+        with open(journal, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # the last line is incomplete if the process died while writing it
+                    continue
+                event = record["event"]
+                if event == "queued":
+                    self._messages[record["key"]] = OutboxMessage(
+                        record["key"], record["match_id"], record["content"], record["queued_at"]
+                    )
+                    continue
+                message = self._messages[record["key"]]
+                if event == "sending":
+                    message.attempted = True
+                    if message.attempted_at is None:
+                        message.attempted_at = record.get("at")
+                elif event == "sent":
+                    message.state = "sent"
+                    message.message_id = record["message_id"]
+                    self._claimed.add(message.message_id)
+                elif event == "failed":
+                    message.state = "failed"
+                    message.error = record["error"]
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __str__(self):
+        return f"Outbox({len(self.pending())} pending of {len(self._messages)})"
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Generic, Iterable, Iterator, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+NextToken = Union[Optional[str], Callable[[], Optional[str]]]
+"""The token of the next page, or a function returning it once the items were consumed"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(4, thread_name_prefix="tinder-pages")
+    return _executor
+
+
+class Paginator(Generic[T]):
+    """
+    Iterates the items of a paged endpoint. The next page is requested in the background as
+    soon as its token is known, so the request runs while the current page is parsed and
+    consumed. Pages are parsed lazily, one at a time.
+
+    Streamed pages only know their token after the last item, pass a function as token for
+    them; the next page is then requested once the items were consumed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[str]], Tuple[Iterable[dict], NextToken]],
+        parse: Callable[[dict], T] = None,
+        page_token: str = None,
+        prefetch: bool = True,
+    ):
+        """
+        Creates a new paginator.
+
+        :param fetch: requests a page by its token, `None` for the first page, and returns
+        the raw items and the token of the next page
+        :param parse: builds an item, default the raw item
+        :param page_token: the token of the first page
+        :param prefetch: request the next page in the background, default true
+        """
+
+        self.fetch = fetch
+        self.parse = parse
+        self.page_token: Optional[str] = page_token
+        self.prefetch: bool = prefetch
+
+    def pages(self) -> Iterator[Iterable[dict]]:
+        """
+        Iterates the raw items page by page.
+
+        :return: the raw items of each page
+        """
+
+        future: Optional[Future] = None
+        try:
+            items, next_token = self.fetch(self.page_token)
+            while True:
+                if self.prefetch and next_token and not callable(next_token):
+                    # the deadline of the caller applies to the background request as well
+                    future = _pool().submit(copy_context().run, self.fetch, next_token)
+                yield items
+                if callable(next_token):
+                    next_token = next_token()
+                if future is not None:
+                    items, next_token = future.result()
+                    future = None
+                elif next_token:
+                    items, next_token = self.fetch(next_token)
+                else:
+                    return
+        finally:
+            if future is not None:
+                future.cancel()
+
+    def __iter__(self) -> Iterator[T]:
+        parse = self.parse
+        for page in self.pages():
+            if parse is None:
+                yield from page
+            else:
+                for raw in page:
+                    yield parse(raw)
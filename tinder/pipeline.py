@@ -0,0 +1,294 @@
+import logging
+import queue
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Union
+
+from tinder.entities.user import Recommendation
+from tinder.exceptions import TinderException
+
+_logger = logging.getLogger("tinder-py")
+
+
+class Decision(Enum):
+    """
+    The action the pipeline performs on a recommendation.
+    """
+
+    LIKE = "like"
+    DISLIKE = "dislike"
+    SUPERLIKE = "superlike"
+    SKIP = "skip"
+
+
+class StageStats:
+    """
+    Throughput counters of a single pipeline stage.
+    """
+
+    __slots__ = ["name", "processed", "errors", "busy_time", "_started", "_lock"]
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.processed: int = 0
+        self.errors: int = 0
+        self.busy_time: float = 0.0
+        self._started: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, busy_time: float, error: bool = False):
+        with self._lock:
+            self.processed += 1
+            self.busy_time += busy_time
+            if error:
+                self.errors += 1
+
+    def throughput(self) -> float:
+        """
+        Gets the processed items per second since the pipeline started.
+
+        :return: the items per second
+        """
+
+        elapsed = time.monotonic() - self._started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_time": round(self.busy_time, 3),
+            "throughput": round(self.throughput(), 3),
+        }
+
+    def __str__(self):
+        return f"StageStats({self.name}:{self.processed} @ {self.throughput():.2f}/s)"
+
+
+_done = object()
+
+
+class SwipePipeline:
+    """
+    Fetches, scores and swipes recommendations in four concurrent stages connected by bounded
+    queues:
+
+    fetch -> score -> decide -> execute
+
+    While the current page is scored and swiped, the next page of `/recs/core` is already being
+    fetched. Full queues block the upstream stage, so a slow executor throttles fetching instead
+    of buffering an unbounded amount of recommendations.
+    """
+
+    def __init__(
+        self,
+        client,
+        scorer: Callable[[Recommendation], Union[float, bool, None]],
+        decider: Optional[Callable[[Recommendation, Union[float, bool, None]], Decision]] = None,
+        queue_size: int = 32,
+        max_pages: Optional[int] = None,
+        like_threshold: float = 0.5,
+        superlike_threshold: Optional[float] = None,
+        on_result: Optional[Callable[[Recommendation, Decision, Optional[Exception]], None]] = None,
+    ):
+        """
+        Creates a new swipe pipeline.
+
+        :param client: the client to fetch recommendations with
+        :param scorer: scores or filters a recommendation. Return a number, `True` to like,
+        `False` to dislike or `None` to skip the user
+        :param decider: maps a recommendation and its score to a decision. Defaults to the
+        thresholds below
+        :param queue_size: the capacity of each queue between two stages
+        :param max_pages: stops after this many pages of recommendations, default unlimited
+        :param like_threshold: the minimum score to like a user, default 0.5
+        :param superlike_threshold: the minimum score to superlike a user, default never
+        :param on_result: called with every executed decision and the error, if any
+        """
+
+        if queue_size < 1:
+            raise ValueError("The queue size must be positive!")
+
+        self._client = client
+        self._scorer = scorer
+        self._decider = decider if decider is not None else self._decide
+        self._max_pages = max_pages
+        self.like_threshold: float = like_threshold
+        self.superlike_threshold: Optional[float] = superlike_threshold
+        self._on_result = on_result
+        self._queues: Dict[str, queue.Queue] = {
+            "fetched": queue.Queue(queue_size),
+            "scored": queue.Queue(queue_size),
+            "decided": queue.Queue(queue_size),
+        }
+        self._stats: Dict[str, StageStats] = {
+            name: StageStats(name) for name in ("fetch", "score", "decide", "execute")
+        }
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.pages: int = 0
+
+    def _decide(self, recommendation: Recommendation, score) -> Decision:
+        if score is None:
+            return Decision.SKIP
+        if score is True:
+            return Decision.LIKE
+        if score is False:
+            return Decision.DISLIKE
+        if self.superlike_threshold is not None and score >= self.superlike_threshold:
+            return Decision.SUPERLIKE
+        if score >= self.like_threshold:
+            return Decision.LIKE
+        return Decision.DISLIKE
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _done
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _fetch(self):
+        stats = self._stats["fetch"]
+        target = self._queues["fetched"]
+        try:
+            while not self._stop.is_set():
+                if self._max_pages is not None and self.pages >= self._max_pages:
+                    break
+                start = time.monotonic()
+                recommendations, exhausted = self._client.get_recommendation_page()
+                self.pages += 1
+                stats.record(time.monotonic() - start)
+                for recommendation in recommendations:
+                    if not self._put(target, recommendation):
+                        return
+                # a page may be empty because the seen filter skipped every user
+                if exhausted:
+                    break
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            self._put(target, _done)
+
+    def _transform(self, name: str, source: str, target: str, function):
+        stats = self._stats[name]
+        source_queue = self._queues[source]
+        target_queue = self._queues[target]
+        try:
+            while True:
+                item = self._get(source_queue)
+                if item is _done:
+                    break
+                start = time.monotonic()
+                result = function(item)
+                stats.record(time.monotonic() - start)
+                if not self._put(target_queue, result):
+                    return
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            self._put(target_queue, _done)
+
+    def _score(self, recommendation: Recommendation):
+        return recommendation, self._scorer(recommendation)
+
+    def _make_decision(self, item):
+        recommendation, score = item
+        return recommendation, self._decider(recommendation, score)
+
+    def _execute(self):
+        stats = self._stats["execute"]
+        source = self._queues["decided"]
+        try:
+            while True:
+                item = self._get(source)
+                if item is _done:
+                    break
+                recommendation, decision = item
+                start = time.monotonic()
+                error = None
+                try:
+                    if decision == Decision.LIKE:
+                        recommendation.like()
+                    elif decision == Decision.DISLIKE:
+                        recommendation.dislike()
+                    elif decision == Decision.SUPERLIKE:
+                        recommendation.superlike()
+                except TinderException as exception:
+                    error = exception
+                    _logger.warning(f"Failed to {decision.value} {recommendation}: {exception}")
+                stats.record(time.monotonic() - start, error is not None)
+                if self._on_result is not None:
+                    self._on_result(recommendation, decision, error)
+        except BaseException as error:
+            self._fail(error)
+
+    def run(self) -> dict:
+        """
+        Runs the pipeline until the API runs out of recommendations, `max_pages` is reached or
+        `stop` is called. Errors of a stage stop the pipeline and are raised here.
+
+        :return: the final stats, see `stats`
+        """
+
+        self._stop.clear()
+        self._error = None
+        threads = [
+            threading.Thread(target=self._fetch, name="tinder-pipeline-fetch", daemon=True),
+            threading.Thread(
+                target=self._transform,
+                args=("score", "fetched", "scored", self._score),
+                name="tinder-pipeline-score",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._transform,
+                args=("decide", "scored", "decided", self._make_decision),
+                name="tinder-pipeline-decide",
+                daemon=True,
+            ),
+            threading.Thread(target=self._execute, name="tinder-pipeline-execute", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.stats()
+
+    def stop(self):
+        """
+        Stops all stages. Items still inside the queues are dropped.
+        """
+
+        self._stop.set()
+
+    def stats(self) -> dict:
+        """
+        Gets throughput per stage and the current depth of each queue.
+
+        :return: a dict with `stages`, `queues` and `pages`
+        """
+
+        return {
+            "stages": {name: stats.as_dict() for name, stats in self._stats.items()},
+            "queues": {name: q.qsize() for name, q in self._queues.items()},
+            "pages": self.pages,
+        }
@@ -0,0 +1,127 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Deque, Iterable, Iterator, Optional, Tuple
+
+from tinder.entities.match import Match
+
+_page_size = 60
+
+
+class MessagePrefetcher:
+    """
+    Iterates matches while the first message page of the next matches is requested in the
+    background. All requests pass the rate limiter of the client, so prefetching only fills
+    the gaps in which the consumer is busy.
+
+    >>> for match in client.prefetch_messages(lookahead=8):
+    ...     print(match.message_history.get_messages())
+    """
+
+    def __init__(
+        self,
+        matches: Iterable[Match],
+        lookahead: int = 8,
+        workers: int = 2,
+        max_messages: int = 6000,
+    ):
+        """
+        Creates a new prefetcher.
+
+        :param matches: the matches in iteration order
+        :param lookahead: the amount of matches ahead of the consumer to prefetch
+        :param workers: the amount of worker threads
+        :param max_messages: the maximum amount of prefetched messages not yet consumed
+        """
+
+        self.lookahead: int = max(0, lookahead)
+        self.workers: int = max(1, workers)
+        self.max_messages: int = max_messages
+        self.hits: int = 0
+        self.misses: int = 0
+        self.skipped: int = 0
+        self.errors: int = 0
+        self._matches: Iterable[Match] = matches
+        self._buffered: int = 0
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("tinder-py")
+
+    def _prefetch(self, match: Match) -> int:
+        size = match.message_history.prefetch()
+        with self._lock:
+            self._buffered += size - _page_size
+        return size
+
+    def _submit(self, executor: ThreadPoolExecutor, match: Match) -> Optional[Future]:
+        if match.message_history.loaded:
+            return None
+        with self._lock:
+            if self._buffered + _page_size > self.max_messages:
+                self.skipped += 1
+                return None
+            self._buffered += _page_size
+        return executor.submit(copy_context().run, self._prefetch, match)
+
+    def _release(self, future: Future):
+        waited = not future.done()
+        try:
+            size = future.result()
+        except Exception as error:
+            # the history stays unloaded and requests its first page once it is accessed
+            self.errors += 1
+            self._logger.warning(f"Prefetching messages failed, loading them lazily: {error!r}")
+            size = _page_size
+        else:
+            if waited:
+                self.misses += 1
+            else:
+                self.hits += 1
+        with self._lock:
+            self._buffered -= size
+
+    def __iter__(self) -> Iterator[Match]:
+        source = iter(self._matches)
+        window: Deque[Tuple[Match, Optional[Future]]] = deque()
+        executor = ThreadPoolExecutor(self.workers, thread_name_prefix="tinder-prefetch")
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(window) <= self.lookahead:
+                    match = next(source, None)
+                    if match is None:
+                        exhausted = True
+                    else:
+                        window.append((match, self._submit(executor, match)))
+                if not window:
+                    return
+                match, future = window.popleft()
+                if future is not None:
+                    self._release(future)
+                yield match
+        finally:
+            for _, future in window:
+                if future is not None and future.cancel():
+                    with self._lock:
+                        self._buffered -= _page_size
+            executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """
+        Gets the prefetch statistics. A miss means the consumer had to wait for a prefetch
+        that was still running; each prefetch counts as either hit, miss or error.
+
+        :return: hits, misses, skipped and failed prefetches and the buffered messages
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "buffered": self._buffered,
+        }
+
+    def __str__(self):
+        return f"MessagePrefetcher({self.lookahead} ahead, {self._buffered} messages buffered)"
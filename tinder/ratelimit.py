@@ -0,0 +1,282 @@
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from tinder.deadline import Deadline
+from tinder.metrics import Metrics
+
+_route_classes = (
+    ("/like/", "swipe"),
+    ("/pass/", "swipe"),
+    ("/recs/", "recs"),
+    ("/v2/recs/", "recs"),
+    ("/user/matches/", "messages"),
+    ("/message/", "messages"),
+    ("/v2/matches/{id}/messages", "messages"),
+)
+
+
+def route_class(template: str) -> str:
+    """
+    Gets the class of a route template. Routes of the same class share one rate limit.
+
+    :param template: the route template, see `route_template`
+    :return: `swipe`, `recs`, `messages` or `default`
+    """
+
+    for prefix, name in _route_classes:
+        if template.startswith(prefix):
+            return name
+    return "default"
+
+
+def account_key(token: str) -> str:
+    """
+    Gets a short, non-reversible key of an auth token to keep the state of each account apart.
+
+    :param token: the auth token
+    :return: the account key
+    """
+
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()[:8]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a <em>Retry-After</em> header, given in seconds or as HTTP date.
+
+    :param value: the header value
+    :return: the seconds to wait, `None` if the header is missing or invalid
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AimdController:
+    """
+    Additive-increase/multiplicative-decrease control of the request rate and the amount of
+    requests in flight. Every successful request raises the rate by about `increase` requests
+    per second per second, a <em>429 Too Many Requests</em> cuts rate and concurrency by
+    `decrease`. Rising latency holds the rate before the server starts rejecting requests.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 10.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        concurrency: int = 2,
+        max_concurrency: int = 8,
+        latency_tolerance: float = 2.0,
+    ):
+        """
+        Creates a new controller.
+
+        :param rate: the initial rate in requests per second
+        :param min_rate: the lowest rate after decreases
+        :param max_rate: the highest rate after increases
+        :param increase: the rate increase per second of successful requests
+        :param decrease: the factor rate and concurrency are multiplied with on a 429
+        :param concurrency: the initial amount of requests in flight
+        :param max_concurrency: the highest amount of requests in flight
+        :param latency_tolerance: holds the rate while the average latency exceeds the lowest
+        seen latency by this factor
+        """
+
+        self.rate: float = rate
+        self.min_rate: float = min_rate
+        self.max_rate: float = max_rate
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.concurrency: float = float(concurrency)
+        self.max_concurrency: int = max_concurrency
+        self.latency_tolerance: float = latency_tolerance
+        self.in_flight: int = 0
+        self.throttled: int = 0
+        self.latency: Optional[float] = None
+        self.min_latency: Optional[float] = None
+        self._next_send: float = 0.0
+        self._blocked_until: float = 0.0
+        self._decreased_at: float = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline: Deadline) -> float:
+        """
+        Waits until a request may be sent, i.e. a concurrency slot is free, the pacing interval
+        has passed and no <em>Retry-After</em> is pending.
+
+        :param deadline: the deadline of the request
+        :return: the send time to pass to `release`
+        """
+
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                if self.in_flight >= max(1, int(self.concurrency)):
+                    wait = None
+                else:
+                    wait = max(self._blocked_until, self._next_send) - now
+                    if wait <= 0:
+                        self.in_flight += 1
+                        self._next_send = now + 1.0 / self.rate
+                        return now
+                if wait is None:
+                    remaining = deadline.remaining()
+                    # woken up by release; the timeout re-checks the deadline and cancellation
+                    self._condition.wait(0.1 if remaining is None else min(0.1, remaining))
+            if wait is None:
+                deadline.check()
+            else:
+                deadline.sleep(wait)
+
+    def release(
+        self,
+        sent_at: float,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Frees the concurrency slot and adjusts rate and concurrency to the outcome.
+
+        :param sent_at: the value returned by `acquire`
+        :param status: the status code, `None` if the request failed without response
+        :param latency: the duration of the request in seconds
+        :param retry_after: the parsed <em>Retry-After</em> header
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status == 429:
+                self.throttled += 1
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                # requests sent before the last decrease were paced by the old rate
+                if sent_at >= self._decreased_at:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.concurrency = max(1.0, self.concurrency * self.decrease)
+                    self._decreased_at = now
+            elif status is not None and status < 500:
+                if latency is not None:
+                    self._observe(latency)
+                if not self.congested():
+                    self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+                    self.concurrency = min(
+                        float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency
+                    )
+            self._condition.notify()
+
+    def _observe(self, latency: float):
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * latency
+
+    def congested(self) -> bool:
+        """
+        Checks whether the latency indicates that requests queue up at the server.
+
+        :return: `true` if the average latency exceeds the tolerance
+        """
+
+        if self.latency is None or not self.min_latency:
+            return False
+        return self.latency > self.min_latency * self.latency_tolerance
+
+    def as_dict(self) -> dict:
+        return {
+            "rate": round(self.rate, 4),
+            "concurrency": int(self.concurrency),
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+        }
+
+    def __str__(self):
+        return f"AimdController({self.rate:.2f} req/s, {int(self.concurrency)} in flight)"
+
+
+class RateControllers:
+    """
+    AIMD controllers per account and route class. Share one instance between the clients of
+    several accounts; each account still gets its own limits.
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, **defaults):
+        """
+        Creates a new controller registry.
+
+        :param metrics: publishes the target rate as `ratelimit.<account>.<class>` gauge
+        :param defaults: the arguments of each new `AimdController`
+        """
+
+        self.metrics: Optional[Metrics] = metrics
+        self._defaults: dict = defaults
+        self._controllers: Dict[Tuple[str, str], AimdController] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: str, route: str) -> AimdController:
+        key = (account, route)
+        controller = self._controllers.get(key)
+        if controller is None:
+            with self._lock:
+                controller = self._controllers.setdefault(key, AimdController(**self._defaults))
+        return controller
+
+    def acquire(self, account: str, template: str, deadline: Deadline) -> float:
+        return self.get(account, route_class(template)).acquire(deadline)
+
+    def release(
+        self,
+        account: str,
+        template: str,
+        sent_at: float,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after: Optional[float] = None,
+    ):
+        name = route_class(template)
+        controller = self.get(account, name)
+        controller.release(sent_at, status, latency, retry_after)
+        if self.metrics is not None:
+            self.metrics.set_gauge(f"ratelimit.{account}.{name}", round(controller.rate, 4))
+
+    def target_rate(self, account: str, route: str = "default") -> float:
+        """
+        Gets the current target rate.
+
+        :param account: the account key, see `account_key`
+        :param route: the route class
+        :return: the target rate in requests per second
+        """
+
+        return self.get(account, route).rate
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Gets the state of all controllers.
+
+        :return: rate, concurrency, requests in flight and 429 count per account and route class
+        """
+
+        return {
+            f"{account}.{route}": controller.as_dict()
+            for (account, route), controller in list(self._controllers.items())
+        }
@@ -0,0 +1,168 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set
+
+from tinder.entities.dates import to_millis
+from tinder.entities.message import Message
+
+_words = re.compile(r"\w+")
+_clauses = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits a text into lowercase words.
+
+    :param text: the text
+    :return: the words in order
+    """
+
+    return _words.findall(text.lower())
+
+
+class MessageIndex:
+    """
+    Positional inverted index over the content of messages. Queries consist of words, prefixes
+    ending with `*` and phrases in double quotes; a message matches if it contains all of them,
+    e.g. `"see you" tomorrow din*`. Results are ranked from recent to past.
+
+    Pass it to the `TinderClient` to index every cached, sent and polled message.
+    """
+
+    def __init__(self):
+        self._messages: List[Message] = []
+        self._dates: List[int] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    def add(self, message: Message) -> bool:
+        """
+        Indexes a message. Messages that are indexed already are skipped.
+
+        :param message: the message
+        :return: `true` if the message was added
+        """
+
+        with self._lock:
+            return self._add(message)
+
+    def add_all(self, messages: Iterable[Message]) -> int:
+        """
+        Indexes several messages.
+
+        :param messages: the messages
+        :return: the amount of added messages
+        """
+
+        with self._lock:
+            return sum(self._add(message) for message in messages)
+
+    def _add(self, message: Message) -> bool:
+        if message.id in self._ids:
+            return False
+        document = len(self._messages)
+        self._ids[message.id] = document
+        self._messages.append(message)
+        self._dates.append(to_millis(message.sent_date))
+        postings = self._postings
+        for position, word in enumerate(tokenize(message.content or "")):
+            documents = postings.get(word)
+            if documents is None:
+                postings[word] = {document: [position]}
+                self._vocabulary = None
+            elif document in documents:
+                documents[document].append(position)
+            else:
+                documents[document] = [position]
+        return True
+
+    def search(self, query: str, limit: int = 20) -> List[Message]:
+        """
+        Finds the most recent messages matching a query.
+
+        :param query: the words, `prefix*` and `"phrases"` that must all be contained
+        :param limit: the maximum amount of messages
+        :return: the matching messages from recent to past
+        """
+
+        with self._lock:
+            documents = self._find(query)
+            dates = self._dates
+            ranked = heapq.nlargest(limit, documents, key=dates.__getitem__)
+            return [self._messages[document] for document in ranked]
+
+    def search_matches(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Finds the conversations with the most recent messages matching a query.
+
+        :param query: the words, `prefix*` and `"phrases"` that must all be contained
+        :param limit: the maximum amount of match ids
+        :return: the ids of the matches from recent to past
+        """
+
+        with self._lock:
+            latest: Dict[str, int] = {}
+            for document in self._find(query):
+                match_id = self._messages[document].match_id
+                date = self._dates[document]
+                if date >= latest.get(match_id, -1):
+                    latest[match_id] = date
+            return heapq.nlargest(limit, latest, key=latest.__getitem__)
+
+    def _find(self, query: str) -> Set[int]:
+        result: Optional[Set[int]] = None
+        for phrase, word in _clauses.findall(query):
+            if phrase:
+                documents = self._phrase(tokenize(phrase))
+            elif word.endswith("*") and tokenize(word):
+                documents = self._prefix(tokenize(word)[0])
+            else:
+                documents = self._phrase(tokenize(word))
+            result = documents if result is None else result & documents
+            if not result:
+                return set()
+        return result or set()
+
+    def _prefix(self, prefix: str) -> Set[int]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        documents: Set[int] = set()
+        index = bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            documents.update(self._postings[vocabulary[index]])
+            index += 1
+        return documents
+
+    def _phrase(self, words: List[str]) -> Set[int]:
+        if not words:
+            return set()
+        postings = [self._postings.get(word) for word in words]
+        if not all(postings):
+            return set()
+        candidates = set(postings[0])
+        for documents in postings[1:]:
+            candidates.intersection_update(documents)
+        if len(words) == 1:
+            return candidates
+        found = set()
+        for document in candidates:
+            following = [set(documents[document]) for documents in postings[1:]]
+            for start in postings[0][document]:
+                if all(start + offset in following[offset - 1] for offset in range(1, len(words))):
+                    found.add(document)
+                    break
+        return found
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __contains__(self, message_id: str):
+        return message_id in self._ids
+
+    def __str__(self):
+        return f"MessageIndex({len(self._messages)} messages, {len(self._postings)} words)"
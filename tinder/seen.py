@@ -0,0 +1,225 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import threading
+from typing import Optional, Tuple
+
+_logger = logging.getLogger("tinder-py")
+
+
+class SeenFilter:
+    """
+    Persistent set of already processed users, keyed by user id and content hash.
+
+    The set is backed by two rotating Bloom filters of a fixed size. New keys are added to the
+    current generation. Once it holds `capacity` keys it becomes the previous generation and a
+    fresh one is started, so memory never grows and the false positive rate stays at
+    `error_rate` for the most recent `capacity` to `2 * capacity` users.
+
+    A user whose `content_hash` changed is treated as unseen.
+    """
+
+    _magic = b"TSF1"
+    _header = struct.Struct("<4sQIdQQ")
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Creates a new seen filter and loads its state from `path` if present.
+
+        :param path: the file to persist the filter to, `None` to keep it in memory only
+        :param capacity: the amount of users per generation
+        :param error_rate: the false positive rate, between 0 and 1
+        :param max_bytes: the memory budget for both generations. Lowers the capacity if the
+        requested capacity does not fit into the budget
+        """
+
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate must be between 0 and 1!")
+        if capacity < 1:
+            raise ValueError("The capacity must be positive!")
+
+        bits = self._optimal_bits(capacity, error_rate)
+        if max_bytes is not None:
+            max_bits = (max_bytes // 2) * 8
+            if max_bits < 8:
+                raise ValueError("The memory budget is too small!")
+            if bits > max_bits:
+                bits = max_bits
+                capacity = max(1, int(bits * math.log(2) ** 2 / -math.log(error_rate)))
+
+        self.path = path
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self._bits: int = (bits + 7) // 8 * 8
+        self._hashes: int = max(1, round(self._bits / capacity * math.log(2)))
+        self._current = bytearray(self._bits // 8)
+        self._previous = bytearray(self._bits // 8)
+        self._count = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    @classmethod
+    def for_account(cls, directory: str, account: str, **kwargs) -> "SeenFilter":
+        """
+        Creates a seen filter persisted inside `directory`, one file per account.
+
+        :param directory: the directory to store the filter in
+        :param account: an identifier of the account, e.g. the self user id
+        :param kwargs: further arguments passed to the constructor
+        :return: the seen filter of the account
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        name = hashlib.sha1(account.encode()).hexdigest()[:16]
+        return cls(os.path.join(directory, f"seen-{name}.bloom"), **kwargs)
+
+    @staticmethod
+    def _optimal_bits(capacity: int, error_rate: float) -> int:
+        return math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+
+    @staticmethod
+    def key(user: dict) -> Tuple[str, str]:
+        """
+        Extracts the key from a raw user dict without building an entity.
+
+        :param user: the raw user dict
+        :return: the user id and the content hash
+        """
+
+        user_id = user.get("_id") or user.get("id") or ""
+        return user_id, user.get("content_hash", "")
+
+    def _positions(self, user_id: str, content_hash: str):
+        digest = hashlib.blake2b(f"{user_id}:{content_hash}".encode(), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        second |= 1
+        for i in range(self._hashes):
+            yield (first + i * second) % self._bits
+
+    @staticmethod
+    def _test(bits: bytearray, positions) -> bool:
+        for position in positions:
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def contains(self, user_id: str, content_hash: str = "") -> bool:
+        """
+        Checks whether a user has been seen. May return false positives at the configured rate,
+        never false negatives for the last `capacity` users.
+
+        :param user_id: the user id
+        :param content_hash: the content hash of the user
+        :return: `true` if the user has been seen
+        """
+
+        positions = tuple(self._positions(user_id, content_hash))
+        with self._lock:
+            return self._test(self._current, positions) or self._test(self._previous, positions)
+
+    def add(self, user_id: str, content_hash: str = ""):
+        """
+        Marks a user as seen.
+
+        :param user_id: the user id
+        :param content_hash: the content hash of the user
+        """
+
+        positions = tuple(self._positions(user_id, content_hash))
+        with self._lock:
+            if self._test(self._current, positions):
+                return
+            if self._count >= self.capacity:
+                self._previous = self._current
+                self._current = bytearray(self._bits // 8)
+                self._count = 0
+            for position in positions:
+                self._current[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+            self._dirty = True
+
+    def seen(self, user: dict) -> bool:
+        """
+        Checks a raw user dict, e.g. an entry of `/recs/core`, against the filter.
+
+        :param user: the raw user dict
+        :return: `true` if the user has been seen
+        """
+
+        return self.contains(*self.key(user))
+
+    def add_raw(self, user: dict):
+        """
+        Marks a raw user dict as seen.
+
+        :param user: the raw user dict
+        """
+
+        self.add(*self.key(user))
+
+    def size_in_bytes(self) -> int:
+        """
+        Gets the memory used by both generations.
+
+        :return: the size in bytes
+        """
+
+        return len(self._current) + len(self._previous)
+
+    def save(self):
+        """
+        Writes the filter to its file, if it has one and changed since the last save.
+        """
+
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            header = self._header.pack(
+                self._magic, self._bits, self._hashes, self.error_rate, self.capacity, self._count
+            )
+            data = header + bytes(self._current) + bytes(self._previous)
+            self._dirty = False
+        temp = f"{self.path}.tmp"
+        with open(temp, "wb") as file:
+            file.write(data)
+        os.replace(temp, self.path)
+
+    def _load(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        size = self._bits // 8
+        try:
+            magic, bits, hashes, _, _, count = self._header.unpack_from(data)
+        except struct.error:
+            magic = None
+        if (
+            magic != self._magic
+            or bits != self._bits
+            or hashes != self._hashes
+            or len(data) != self._header.size + 2 * size
+        ):
+            _logger.warning(
+                f"Discarding seen filter {self.path}, it was created with different settings."
+            )
+            return
+        offset = self._header.size
+        self._current = bytearray(data[offset : offset + size])
+        self._previous = bytearray(data[offset + size :])
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __str__(self):
+        return f"SeenFilter({self._count}/{self.capacity}:{self.size_in_bytes()} bytes)"
@@ -0,0 +1,127 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Tuple
+
+_whitespace = " \t\n\r"
+_delimiters = _whitespace + ",]}"
+_decoder = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    """
+    Iterates the items of an array inside a JSON document while the document is still being
+    received. Only the current item is held in memory, so the peak memory depends on the item
+    size instead of the response size.
+
+    >>> items = JsonArrayStream(response.iter_content(), ("data", "matches"))
+    >>> for item in items:
+    ...     print(item["_id"])
+    >>> items.siblings.get("next_page_token")
+    """
+
+    def __init__(self, chunks: Iterable[bytes], path: Tuple[str, ...]):
+        """
+        Creates a new stream.
+
+        :param chunks: the chunks of the UTF-8 encoded document
+        :param path: the keys leading to the array, e.g. `("data", "matches")`
+        """
+
+        self.path: Tuple[str, ...] = tuple(path)
+        self.siblings: dict = {}
+        """The other values of the objects along the path, available once they were read"""
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._pos > 65536:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                char = self._buffer[self._pos]
+                if char not in _whitespace:
+                    return char
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str):
+        char = self._peek()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} at {self._pos}, got {char!r}!")
+        self._pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number that is not followed by a delimiter might continue in the next chunk,
+            # e.g. `1` of `1.5` or `3` of `3e2`
+            if (
+                type(value) in (int, float)
+                and (end == len(self._buffer) or self._buffer[end] not in _delimiters)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def _object(self, path: Tuple[str, ...]) -> Iterator:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key != path[0]:
+                self.siblings[key] = self._value()
+            elif len(path) > 1:
+                yield from self._object(path[1:])
+            else:
+                yield from self._array()
+            if self._peek() == ",":
+                self._pos += 1
+            else:
+                self._expect("}")
+                return
+
+    def _array(self) -> Iterator:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._peek() == ",":
+                self._pos += 1
+            else:
+                self._expect("]")
+                return
+
+    def __iter__(self) -> Iterator:
+        if self.path:
+            yield from self._object(self.path)
+        else:
+            yield from self._array()
@@ -0,0 +1,164 @@
+import json
+import os
+import shutil
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import takewhile
+from typing import Dict, Iterable, List
+
+from tinder.entities.dates import to_millis
+from tinder.entities.match import Match, MessageHistory
+from tinder.entities.message import Message
+from tinder.export import match_fields, match_record, message_fields, message_record, open_writer
+
+
+class Mirror:
+    """
+    Incremental local copy of the matches and messages of an account. The first sync copies
+    everything; later syncs only request `/updates` since the previous sync and the message
+    pages of the changed matches back to the newest mirrored message. The directory contains
+    `matches.ndjson`, `messages.ndjson` and the sync state in `state.json`.
+
+    Rows are written to `.part` files first, so a failed sync leaves the mirror as it was and
+    the next sync repeats it. Before the parts are added to the mirror, the new state is saved
+    with the sizes the mirror files had; if adding them is interrupted, the mirror is cut back to
+    those sizes and the parts are added again when the mirror is opened next.
+    """
+
+    def __init__(self, client, directory: str, lookahead: int = 8, workers: int = 2):
+        """
+        Creates a new mirror.
+
+        :param client: the client of the account
+        :param directory: the directory to write to
+        :param lookahead: the amount of message histories to prefetch during the first sync
+        :param workers: the amount of threads prefetching message histories
+        """
+
+        self.client = client
+        self.directory: str = directory
+        self.lookahead: int = lookahead
+        self.workers: int = workers
+        self.cursor: str = ""
+        """The `last_activity_date` of the previous sync"""
+        self.last_message: Dict[str, int] = {}
+        """The `sent_date` of the newest mirrored message per match, in milliseconds"""
+        self._publishing: Dict[str, int] = {}
+        """The sizes to cut the mirror files back to before their parts are added, per file name"""
+        os.makedirs(directory, exist_ok=True)
+        self._state_path = os.path.join(directory, "state.json")
+        if os.path.exists(self._state_path):
+            with open(self._state_path, encoding="utf-8") as file:
+                state = json.load(file)
+            self.cursor = state["cursor"]
+            # converted, as mirrors of earlier versions kept the dates as sent by the API
+            self.last_message = {k: to_millis(v) for k, v in state["last_message"].items()}
+            self._publishing = state.get("publishing", {})
+        if self._publishing:
+            # the previous sync stopped while adding its rows to the mirror
+            self._publish()
+
+    def sync(self) -> dict:
+        """
+        Copies the matches and messages that changed since the previous sync.
+
+        :return: the amount of new matches and messages
+        """
+
+        # taken before requesting, so changes during the sync are part of the next one
+        cursor = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        full = not self.cursor
+        last_message = dict(self.last_message)
+        paths = [os.path.join(self.directory, f"{name}.ndjson") for name in ("matches", "messages")]
+        parts = [f"{path}.part" for path in paths]
+        try:
+            with open_writer(parts[0], match_fields, "ndjson") as matches, open_writer(
+                parts[1], message_fields, "ndjson"
+            ) as messages:
+                if full:
+                    self._sync_all(matches, messages)
+                else:
+                    cursor = self._sync_updates(matches, messages) or cursor
+        except BaseException:
+            self.last_message = last_message
+            for part in parts:
+                if os.path.exists(part):
+                    os.remove(part)
+            raise
+        # a full sync replaces the mirror, an incremental one appends to it
+        self._publishing = {
+            os.path.basename(path): 0 if full or not os.path.exists(path) else os.path.getsize(path)
+            for path in paths
+        }
+        self.cursor = cursor
+        self._save()
+        self._publish()
+        return {"matches": matches.written, "messages": messages.written}
+
+    def _publish(self):
+        for name, size in self._publishing.items():
+            path = os.path.join(self.directory, name)
+            part = f"{path}.part"
+            if not os.path.exists(part):
+                # added and removed already
+                continue
+            if size == 0:
+                os.replace(part, path)
+                continue
+            with open(path, "r+b") as target, open(part, "rb") as source:
+                # drops the rows of an interrupted earlier attempt
+                target.truncate(size)
+                target.seek(size)
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+            os.remove(part)
+        self._publishing = {}
+        self._save()
+
+    def _sync_all(self, matches, messages):
+        prefetcher = self.client.prefetch_messages(
+            self.client.iter_matches(cache=False), self.lookahead, self.workers
+        )
+        for match in prefetcher:
+            matches.write(match_record(match))
+            self._write_messages(match.id, match.message_history.load_all_messages(), messages)
+
+    def _sync_updates(self, matches, messages) -> str:
+        update = self.client.get_updates(self.cursor, slim=True)
+        changed = defaultdict(int)
+        for match_id in update.new_matches:
+            match = self.client.get_match(match_id)
+            matches.write(match_record(match))
+            changed[match_id] += 1
+        for message in update.new_messages:
+            changed[message.match_id] += 1
+        for match_id in changed:
+            match: Match = self.client.get_match(match_id)
+            # a fresh history, the one of a cached match only holds the messages of its first load
+            history = MessageHistory(match.http, match.id)
+            last = self.last_message.get(match_id, 0)
+            # pages back to the newest mirrored message, however many pages arrived since
+            new = takewhile(lambda m: to_millis(m.sent_date) > last, history.iter_messages())
+            self._write_messages(match.id, new, messages)
+        return update.last_activity_date
+
+    def _write_messages(self, match_id: str, history: Iterable[Message], messages):
+        last = self.last_message.get(match_id, 0)
+        new: List[Message] = [m for m in history if to_millis(m.sent_date) > last]
+        new.sort(key=lambda m: to_millis(m.sent_date))
+        for message in new:
+            messages.write(message_record(message))
+        if new:
+            self.last_message[match_id] = to_millis(new[-1].sent_date)
+
+    def _save(self):
+        temp = self._state_path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            state = {"cursor": self.cursor, "last_message": self.last_message}
+            if self._publishing:
+                state["publishing"] = self._publishing
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, self._state_path)
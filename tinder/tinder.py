@@ -1,12 +1,26 @@
+from __future__ import annotations
+
 import logging
+import time
 from datetime import datetime
-from typing import Tuple, List
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple
 
-from tinder.entities.update import Update
-from tinder.entities.match import Match
 from tinder.exceptions import Unauthorized, LoginException
-from tinder.http import Http
-from tinder.entities.user import UserProfile, LikePreview, Recommendation, SelfUser, LikedUser
+
+if TYPE_CHECKING:
+    # the modules are imported by the methods using them, so importing the client stays cheap
+    from tinder.activity import ActivityIndex
+    from tinder.circuit import CircuitBreakers
+    from tinder.deadline import Deadline
+    from tinder.entities.match import Match
+    from tinder.entities.message import Message
+    from tinder.entities.update import Update
+    from tinder.entities.user import UserProfile, LikePreview, Recommendation, SelfUser, LikedUser
+    from tinder.prefetch import MessagePrefetcher
+    from tinder.ratelimit import RateControllers
+    from tinder.search import MessageIndex
+    from tinder.seen import SeenFilter
+    from tinder.transport import Transport
 
 
 class TinderClient:
@@ -14,18 +28,70 @@ class TinderClient:
     The client can send requests to the Tinder API.
     """
 
-    def __init__(self, auth_token: str, log_level: int = logging.INFO, ratelimit: int = 10, load_self=False):
+    def __init__(
+        self,
+        auth_token: str,
+        log_level: int = logging.INFO,
+        ratelimit: int = 10,
+        load_self=False,
+        seen_filter: SeenFilter = None,
+        response_cache_size: int = 16 * 1024 * 1024,
+        transport: Transport = None,
+        circuit_breakers: CircuitBreakers = None,
+        request_timeout: float = 30.0,
+        entity_cache_size: int = 10000,
+        rate_controllers: RateControllers = None,
+        slim_updates: bool = False,
+        base_url: str = None,
+        message_index: MessageIndex = None,
+        activity_index: ActivityIndex = None,
+    ):
         """
         Constructs a new client.
 
         :param auth_token: the <em>X-Auth-Token</em>
         :param log_level: the log level, default INFO
         :param ratelimit: the ratelimit multiplicator, default 10
+        :param seen_filter: skips recommendations that were already returned once, default None
+        :param response_cache_size: the size in bytes of the conditional GET cache, 0 to disable
+        :param transport: the HTTP backend, default a `RequestsTransport`
+        :param circuit_breakers: circuit breakers per route, share them between clients to let all
+        of them fail fast during outages. Default a new instance for this client
+        :param request_timeout: the budget in seconds of a single request including retries and
+        rate limit waits, default 30. Use a `Deadline` to limit several requests at once
+        :param entity_cache_size: the amount of parsed recommendations and liked users to keep,
+        unchanged profiles are not parsed again. 0 to disable
+        :param rate_controllers: adapts the request rate to the 429 responses of the API instead
+        of the fixed `ratelimit`. Share it between clients; each account keeps its own limits
+        :param slim_updates: drop the raw response of `get_updates` by default, see `Update`
+        :param base_url: the API to send requests to, default `https://api.gotinder.com`
+        :param message_index: indexes the content of all cached, sent and polled messages for
+        `MessageIndex.search`
+        :param activity_index: tracks the last activity of all loaded and polled matches for
+        `get_recent_matches`
         """
 
-        self._http = Http(auth_token, log_level, ratelimit)
+        from tinder.cache import EntityCache
+        from tinder.http import Http
+
+        self._http = Http(
+            auth_token,
+            log_level,
+            ratelimit,
+            response_cache_size,
+            transport,
+            circuit_breakers,
+            request_timeout,
+            rate_controllers,
+            base_url,
+        )
         self._self_user = None
         self._matches: dict = {}
+        self._seen_filter = seen_filter
+        self.slim_updates: bool = slim_updates
+        self.message_index: Optional[MessageIndex] = message_index
+        self.activity_index: Optional[ActivityIndex] = activity_index
+        self.entity_cache = EntityCache(entity_cache_size) if entity_cache_size else None
         if load_self:
             try:
                 self._self_user = self.get_self_user()
@@ -35,6 +101,35 @@ class TinderClient:
                 raise LoginException()
             self.active = True
 
+    def close(self):
+        """
+        Closes the connections of the client and finishes a cassette that is being recorded.
+        """
+
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Gets a snapshot of the request metrics, including the state of each circuit breaker.
+
+        :return: the request metrics
+        """
+
+        snapshot = self._http.metrics.snapshot()
+        snapshot["circuits"] = self._http.circuit_breakers.snapshot()
+        if self._http.rate_controllers is not None:
+            snapshot["ratelimit"] = self._http.rate_controllers.snapshot()
+        if self.entity_cache is not None:
+            snapshot["entity_cache"] = self.entity_cache.stats()
+        return snapshot
+
     def invalidate_match(self, match: Match):
         """
         Removes a match from the cache.
@@ -51,64 +146,354 @@ class TinderClient:
 
         self._self_user = None
 
-    def get_updates(self, last_activity_date: str = "") -> Update:
+    def get_updates(
+        self, last_activity_date: str = "", slim: bool = None, stream: bool = False
+    ) -> Update:
         """
         Gets updates from the Tinder API, such as new matches or new messages.
 
         :param last_activity_date:
+        :param slim: keep only the ids of new matches and messages, defaults to `slim_updates`
+        :param stream: parse the matches while the response is received instead of decoding the
+        whole response first. Streamed updates are always slim
         :return: updates from the Tinder API
         """
 
+        from tinder.entities.update import Update
+
         if last_activity_date == "":
             last_activity_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.00Z")
-        response = self._http.make_request(
-            method="POST",
-            route="/updates",
-            body={"nudge": True, "last_activity_date": f"{last_activity_date}"},
-        ).json()
-        return Update(response)
+        kwargs = {
+            "method": "POST",
+            "route": "/updates",
+            "body": {"nudge": True, "last_activity_date": f"{last_activity_date}"},
+        }
+        if stream:
+            matches = self._http.stream_items(("matches",), **kwargs)
+            update = Update({"matches": self._observe_matches(matches)}, slim=True)
+            update.last_activity_date = matches.siblings.get("last_activity_date")
+            return update
+        response = self._http.make_request(**kwargs).json()
+        if self.message_index is not None or self.activity_index is not None:
+            for match in response["matches"]:
+                self._observe(match)
+        return Update(response, self.slim_updates if slim is None else slim)
+
+    def _observe_matches(self, matches: Iterable[dict]) -> Iterable[dict]:
+        # feeds the indexes while the raw matches are consumed
+        if self.message_index is None and self.activity_index is None:
+            return matches
+        return (self._observe(match) for match in matches)
+
+    def _observe(self, match: dict) -> dict:
+        from tinder.entities.message import Message
+
+        if self.message_index is not None:
+            self.message_index.add_all(Message(m, self._http) for m in match.get("messages", ()))
+        if self.activity_index is not None:
+            self.activity_index.add_raw(match)
+        return match
 
     def get_recommendations(self) -> Tuple[Recommendation]:
         """
-        Gets recommended users.
+        Gets recommended users. If the client has a seen filter, users that were already
+        returned are skipped before they are parsed and the returned users are marked as seen.
 
         :return: a tuple of recommended users
         """
 
+        return self.get_recommendation_page()[0]
+
+    def get_recommendation_page(self) -> Tuple[Tuple[Recommendation], bool]:
+        """
+        Gets recommended users like `get_recommendations` and whether the API ran out of them.
+        The users may be empty while more are available, e.g. if the seen filter skipped all.
+
+        :return: the recommended users and `true` if the API returned no more results
+        """
+
+        from tinder.entities.user import Recommendation
+
         response = self._http.make_request(method="GET", route="/recs/core").json()
-        return tuple(Recommendation(r, self._http) for r in response["results"])
+        results = response.get("results") or []
+        exhausted = len(results) == 0
+        if self._seen_filter is not None:
+            results = [r for r in results if not self._seen_filter.seen(r)]
+            for r in results:
+                self._seen_filter.add_raw(r)
+            self._seen_filter.save()
+        users = tuple(
+            self._cached_user(
+                Recommendation,
+                r["_id"],
+                r.get("content_hash"),
+                lambda: Recommendation(r, self._http),
+                r,
+            )
+            for r in results
+        )
+        return users, exhausted
+
+    def iter_recommendations(self) -> Iterator[Recommendation]:
+        """
+        Iterates recommended users while the response is still being received, see
+        `get_recommendations`.
+
+        :return: the recommended users
+        """
+
+        from tinder.entities.user import Recommendation
+
+        for r in self._http.stream_items(("results",), method="GET", route="/recs/core"):
+            if self._seen_filter is not None:
+                if self._seen_filter.seen(r):
+                    continue
+                self._seen_filter.add_raw(r)
+            yield self._cached_user(
+                Recommendation,
+                r["_id"],
+                r.get("content_hash"),
+                lambda: Recommendation(r, self._http),
+                r,
+            )
+        if self._seen_filter is not None:
+            self._seen_filter.save()
 
     def get_like_previews(self) -> Tuple[LikePreview]:
         """
-        Gets users that liked the self user.
+        Gets users that liked the self user and whose like did not expire yet.
 
         :return: a tuple of users that liked the self user
         """
 
-        response = self._http.make_request(method="GET", route="/v2/fast-match/teasers").json()
-        return tuple(LikePreview(user["user"], self._http) for user in response["data"]["results"])
+        return tuple(self.iter_like_previews())
+
+    def iter_like_previews(self, include_expired: bool = False) -> Iterator[LikePreview]:
+        """
+        Iterates all users that liked the self user, page by page.
+
+        :param include_expired: also return users whose `expire_time` has passed
+        :return: the users that liked the self user
+        """
+
+        from tinder.entities.user import LikePreview
+        from tinder.pagination import Paginator
+
+        now = time.time() * 1000
+        for user in Paginator(self._likes_page("/v2/fast-match/teasers")):
+            if not include_expired and user.get("expire_time", now) < now:
+                continue
+            yield LikePreview(user["user"], self._http)
 
-    def load_all_matches(self, page_token: str = None) -> Tuple[Match]:
+    def load_all_matches(self, page_token: str = None, deadline: Deadline = None) -> Tuple[Match]:
         """
         Gets all matches from the Tinder API.
 
+        :param deadline: limits the time and allows cancelling the requests of all pages
         :return: a tuple of all matches
         """
 
-        route = f"/v2/matches?count=60"
-        if page_token:
-            route = f"{route}&page_token={page_token}"
+        from tinder.entities.match import Match
+        from tinder.pagination import Paginator
 
-        data = self._http.make_request(method="GET", route=route).json()["data"]
-        matches: List[Match] = list(Match(m, self._http, self) for m in data["matches"])
-        if "next_page_token" in data:
-            matches.extend(self.load_all_matches(data["next_page_token"]))
+        if deadline is not None:
+            with deadline:
+                return self.load_all_matches(page_token)
 
+        pages = self._observe_matches(Paginator(self._fetch_matches, page_token=page_token))
+        # each page is built while the next one is requested
+        matches: List[Match] = [Match(raw, self._http, self) for raw in pages]
         self._matches.clear()
         for match in matches:
-            self._matches.update(key=match.id, value=match)
+            self._matches[match.id] = match
         return tuple(matches)
 
+    def iter_matches(self, deadline: Deadline = None, cache: bool = True) -> Iterator[Match]:
+        """
+        Iterates all matches page by page. Each match is built as soon as it was received, so
+        only a single match has to be decoded at a time.
+
+        :param deadline: limits the time and allows cancelling the requests of all pages
+        :param cache: keep the matches for `get_match`. Disable it to iterate large accounts in
+        constant memory
+        :return: all matches
+        """
+
+        from tinder.entities.match import Match
+        from tinder.pagination import Paginator
+
+        def fetch(page_token: Optional[str]):
+            items = self._http.stream_items(
+                ("data", "matches"),
+                method="GET",
+                route=self._matches_route(page_token),
+                deadline=deadline,
+            )
+            return items, lambda: items.siblings.get("next_page_token")
+
+        for raw in self._observe_matches(Paginator(fetch)):
+            match = Match(raw, self._http, self)
+            if cache:
+                self._matches[match.id] = match
+            yield match
+
+    @staticmethod
+    def _matches_route(page_token: Optional[str]) -> str:
+        route = "/v2/matches?count=60"
+        if page_token:
+            route = f"{route}&page_token={page_token}"
+        return route
+
+    def _fetch_matches(self, page_token: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+        route = self._matches_route(page_token)
+        data = self._http.make_request(method="GET", route=route).json()["data"]
+        return data["matches"], data.get("next_page_token")
+
+    def prefetch_messages(
+        self,
+        matches: Iterable[Match] = None,
+        lookahead: int = 8,
+        workers: int = 2,
+        max_messages: int = 6000,
+    ) -> MessagePrefetcher:
+        """
+        Iterates matches while the message histories of the next matches are requested in the
+        background, so `match.message_history.get_messages()` finds them cached.
+
+        :param matches: the matches to iterate, defaults to all matches
+        :param lookahead: the amount of matches ahead of the consumer to prefetch
+        :param workers: the amount of worker threads
+        :param max_messages: the maximum amount of prefetched messages not yet consumed
+        :return: the prefetcher to iterate
+        """
+
+        from tinder.prefetch import MessagePrefetcher
+
+        if matches is None:
+            matches = self.load_all_matches()
+        return MessagePrefetcher(matches, lookahead, workers, max_messages)
+
+    def export_matches(self, path: str, format: str = None, chunk_size: int = 1000) -> int:
+        """
+        Writes all matches to a file while the pages are received. The memory use does not
+        depend on the amount of matches.
+
+        :param path: the file to write to, `.gz` to compress csv and ndjson
+        :param format: `csv`, `ndjson` or `parquet` (requires pyarrow), default guessed from
+        the file extension
+        :param chunk_size: the amount of matches per written chunk or Parquet row group
+        :return: the amount of exported matches
+        """
+
+        from tinder.export import match_fields, match_record, open_writer
+
+        with open_writer(path, match_fields, format, chunk_size) as writer:
+            return writer.write_all(match_record(m) for m in self.iter_matches(cache=False))
+
+    def export_messages(
+        self,
+        path: str,
+        format: str = None,
+        chunk_size: int = 1000,
+        lookahead: int = 8,
+        workers: int = 2,
+    ) -> int:
+        """
+        Writes the messages of all matches to a file. The next message histories are requested
+        in the background and no history is kept after it was written, so the memory use does
+        not depend on the amount of matches or messages.
+
+        :param path: the file to write to, `.gz` to compress csv and ndjson
+        :param format: `csv`, `ndjson` or `parquet` (requires pyarrow), default guessed from
+        the file extension
+        :param chunk_size: the amount of messages per written chunk or Parquet row group
+        :param lookahead: the amount of message histories to prefetch
+        :param workers: the amount of threads prefetching message histories
+        :return: the amount of exported messages
+        """
+
+        from tinder.export import message_fields, message_record, open_writer
+
+        matches = self.prefetch_messages(self.iter_matches(cache=False), lookahead, workers)
+        with open_writer(path, message_fields, format, chunk_size) as writer:
+            for match in matches:
+                for message in match.message_history.iter_messages():
+                    writer.write(message_record(message))
+        return writer.written
+
+    def load_activity(self, deadline: Deadline = None) -> ActivityIndex:
+        """
+        Fills the activity index from all match pages without building `Match` objects. Later
+        `get_updates` calls keep it up to date.
+
+        :param deadline: limits the time and allows cancelling the requests of all pages
+        :return: the activity index, a new one if the client has none
+        """
+
+        from tinder.activity import ActivityIndex
+        from tinder.pagination import Paginator
+
+        if deadline is not None:
+            with deadline:
+                return self.load_activity()
+
+        if self.activity_index is None:
+            self.activity_index = ActivityIndex()
+        self.activity_index.add_all(Paginator(self._fetch_matches))
+        return self.activity_index
+
+    def get_recent_matches(self, k: int = 10) -> Tuple[Match]:
+        """
+        Gets the most recently active matches of the activity index, see `load_activity`.
+        Matches that are not cached are requested one by one.
+
+        :param k: the amount of matches
+        :return: the matches from recent to past
+        """
+
+        if self.activity_index is None:
+            self.load_activity()
+        return tuple(self.get_match(match_id) for match_id in self.activity_index.top_k(k))
+
+    def send_message(self, match_id: str, content: str, retry: bool = True) -> Message:
+        """
+        Sends a message to a match by id, without loading the match. The message is added to
+        the history of the match if it is cached.
+
+        :param match_id: the match id
+        :param content: the text to send
+        :param retry: retry on server errors. Disable it if the message must not be sent twice
+        :return: the sent message
+        """
+
+        from tinder.entities.message import Message
+
+        response = self._http.make_request(
+            method="POST",
+            route=f"/user/matches/{match_id}",
+            body={"message": content},
+            retry=retry,
+        ).json()
+        message = Message(response, self._http)
+        match = self._matches.get(match_id)
+        if match is not None:
+            match.message_history.add_message(message)
+        elif self.message_index is not None:
+            self.message_index.add(message)
+        return message
+
+    def get_recent_messages(self, match_id: str) -> Tuple[Message]:
+        """
+        Requests the first page of messages of a match, bypassing the cached history.
+
+        :param match_id: the match id
+        :return: the most recent messages
+        """
+
+        from tinder.entities.match import MessageHistory
+
+        return MessageHistory(self._http, match_id).get_messages()
+
     def get_match(self, match_id: str) -> Match:
         """
         Gets a match by id.
@@ -117,11 +502,15 @@ class TinderClient:
         :return: a match by id
         """
 
+        from tinder.entities.match import Match
+
         if match_id in self._matches:
             return self._matches[match_id]
         else:
-            response = self._http.make_request(method="GET", route=f"/v2/matches/{match_id}").json()
-            match = Match(response["data"], self._http, self)
+            match = self._http.get_cached(
+                f"/v2/matches/{match_id}",
+                lambda response: Match(response["data"], self._http, self),
+            )
             self._matches[match.id] = match
             return match
 
@@ -133,8 +522,11 @@ class TinderClient:
         :return: a user profile by id
         """
 
-        response = self._http.make_request(method="GET", route=f"/user/{user_id}").json()
-        return UserProfile(response["results"], self._http)
+        from tinder.entities.user import UserProfile
+
+        return self._http.get_cached(
+            f"/user/{user_id}", lambda response: UserProfile(response["results"], self._http)
+        )
 
     def get_self_user(self) -> SelfUser:
         """
@@ -143,26 +535,72 @@ class TinderClient:
         :return: the self user
         """
 
+        from tinder.entities.user import SelfUser
+
         if self._self_user is None:
-            response = self._http.make_request(method="GET", route="/profile").json()
-            return SelfUser(response, self._http)
+            return self._http.get_cached(
+                "/profile", lambda response: SelfUser(response, self._http)
+            )
         else:
             return self._self_user
 
     def get_liked_users(self) -> Tuple[LikedUser]:
         """
-        Gets all users that the self user liked.
+        Gets all users that the self user liked and whose like did not expire yet.
 
         :return: a tuple of all liked users
         """
 
-        response = self._http.make_request(method="GET", route="/v2/my-likes").json()
-        result = []
-        for user in response["data"]["results"]:
-            transformed = {}
-            transformed.update(user.items())
-            transformed.pop("type")
-            transformed.pop("user")
-            transformed.update(user["user"].items())
-            result.append(transformed)
-        return tuple(LikedUser(user, self._http) for user in result)
+        return tuple(self.iter_liked_users())
+
+    def iter_liked_users(self, include_expired: bool = False) -> Iterator[LikedUser]:
+        """
+        Iterates all users that the self user liked, page by page.
+
+        :param include_expired: also return users whose `expire_time` has passed
+        :return: the liked users
+        """
+
+        from tinder.entities.user import LikedUser
+        from tinder.pagination import Paginator
+
+        now = time.time() * 1000
+        for user in Paginator(self._likes_page("/v2/my-likes")):
+            if not include_expired and user.get("expire_time", now) < now:
+                continue
+            yield self._cached_user(
+                LikedUser,
+                user["user"]["_id"],
+                user.get("content_hash"),
+                lambda: LikedUser(user, self._http),
+                user,
+            )
+
+    def _likes_page(self, route: str) -> Callable:
+        def fetch(page_token: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+            url = f"{route}?page_token={page_token}" if page_token else route
+            data = self._http.make_request(method="GET", route=url).json()["data"]
+            return data["results"], data.get("page_token") or data.get("next_page_token")
+
+        return fetch
+
+    def _cached_user(
+        self, cls, user_id: str, content_hash: Optional[str], build: Callable, raw: dict
+    ):
+        """
+        Builds a user, reusing the cached entity if its content hash did not change.
+
+        :param cls: the user class
+        :param user_id: the user id
+        :param content_hash: the content hash of the user, if any
+        :param build: builds the user on a cache miss
+        :param raw: the raw user, refreshes the fields of a cached user that the content hash
+        does not cover
+        :return: the user
+        """
+
+        if self.entity_cache is None or content_hash is None:
+            return build()
+        return self.entity_cache.get_or_build(
+            cls, user_id, content_hash, build, lambda user: user.refresh(raw)
+        )
@@ -0,0 +1,321 @@
+import json
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+
+class Response:
+    """
+    A transport independent HTTP response. Header names are lower case.
+    """
+
+    __slots__ = ["status_code", "headers", "_content", "url", "_stream", "_close"]
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict,
+        content: bytes = b"",
+        url: str = "",
+        stream: Optional[Iterator[bytes]] = None,
+        close: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Creates a new response.
+
+        :param status_code: the status code
+        :param headers: the response headers
+        :param content: the body, empty if the body is streamed
+        :param url: the requested url
+        :param stream: the chunks of a body that was not read yet
+        :param close: releases the connection of a streamed body
+        """
+
+        self.status_code: int = status_code
+        self.headers: Dict[str, str] = {key.lower(): value for key, value in headers.items()}
+        self._content: bytes = content
+        self.url: str = url
+        self._stream: Optional[Iterator[bytes]] = stream
+        self._close: Optional[Callable[[], None]] = close
+
+    @property
+    def content(self) -> bytes:
+        return self.read()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def read(self) -> bytes:
+        """
+        Reads the rest of a streamed body and releases the connection.
+
+        :return: the body
+        """
+
+        if self._stream is not None:
+            stream, self._stream = self._stream, None
+            try:
+                self._content = b"".join(stream)
+            finally:
+                self.close()
+        return self._content
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Iterates the body in chunks. A streamed body is read from the connection while it is
+        iterated and can only be iterated once.
+
+        :param chunk_size: the chunk size of bodies that were read already
+        :return: the chunks of the body
+        """
+
+        if self._stream is None:
+            content = self._content
+            for start in range(0, len(content), chunk_size):
+                yield content[start : start + chunk_size]
+            return
+        stream, self._stream = self._stream, None
+        try:
+            yield from stream
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Releases the connection of a streamed body.
+        """
+
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+    def __str__(self):
+        return f"Response({self.status_code}:{self.url})"
+
+
+class Transport:
+    """
+    ABC for the backends `Http` sends its requests with.
+    """
+
+    local: bool = False
+    """`true` if requests are answered without reaching the API, so no rate limit applies"""
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        """
+        Sends a request.
+
+        :param method: the HTTP method
+        :param url: the absolute url
+        :param headers: the request headers
+        :param body: the json body, if any
+        :param timeout: the connect and read timeout in seconds, `None` to wait forever
+        :param stream: read the body lazily through `Response.iter_content` instead of
+        buffering it
+        :return: the response
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Releases all connections of the transport.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Transport backed by a `requests.Session`. This is the default transport.
+    """
+
+    def __init__(self):
+        import requests
+
+        self._session = requests.Session()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        response = self._session.request(
+            method, url, headers=headers, json=body, timeout=timeout, stream=stream
+        )
+        if stream:
+            chunks = response.iter_content(65536)
+            return Response(
+                response.status_code, response.headers, b"", url, chunks, response.close
+            )
+        return Response(response.status_code, response.headers, response.content, url)
+
+    def close(self):
+        self._session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport backed by a raw `urllib3` connection pool.
+    """
+
+    def __init__(self, maxsize: int = 10):
+        """
+        Creates a new urllib3 transport.
+
+        :param maxsize: the maximum amount of connections per host
+        """
+
+        import urllib3
+
+        self._pool = urllib3.PoolManager(maxsize=maxsize, block=True)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        data = json.dumps(body).encode() if body is not None else None
+        response = self._pool.request(
+            method,
+            url,
+            headers=headers,
+            body=data,
+            timeout=timeout,
+            retries=False,
+            preload_content=not stream,
+        )
+        if stream:
+            chunks = response.stream(65536)
+            return Response(
+                response.status, dict(response.headers), b"", url, chunks, response.release_conn
+            )
+        return Response(response.status, dict(response.headers), response.data, url)
+
+    def close(self):
+        self._pool.clear()
+
+
+class Http2Transport(Transport):
+    """
+    Transport backed by `httpx` with HTTP/2 enabled. Concurrent requests from several threads are
+    multiplexed over a single connection. Requires `pip install httpx[http2]`.
+    """
+
+    def __init__(self, max_connections: int = 1):
+        """
+        Creates a new HTTP/2 transport.
+
+        :param max_connections: the maximum amount of connections per host
+        """
+
+        try:
+            import httpx
+        except ImportError as error:
+            raise ImportError("The HTTP/2 transport requires httpx[http2]!") from error
+
+        self._client = httpx.Client(
+            http2=True, limits=httpx.Limits(max_connections=max_connections), timeout=None
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        if stream:
+            request = self._client.build_request(
+                method, url, headers=headers, json=body, timeout=timeout
+            )
+            response = self._client.send(request, stream=True)
+            chunks = response.iter_bytes(65536)
+            return Response(
+                response.status_code, dict(response.headers), b"", url, chunks, response.close
+            )
+        response = self._client.request(method, url, headers=headers, json=body, timeout=timeout)
+        return Response(response.status_code, dict(response.headers), response.content, url)
+
+    def close(self):
+        self._client.close()
+
+
+Handler = Union[dict, list, Response, Callable[[str, str, Optional[dict]], Response]]
+
+
+class FakeTransport(Transport):
+    """
+    In-memory transport for tests. Responses are registered per method and route; every request
+    is recorded in `requests`. Requests skip the rate limits.
+    """
+
+    local = True
+
+    def __init__(self):
+        self.requests: List[Tuple[str, str, Optional[dict]]] = []
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        method: str,
+        route: str,
+        response: Handler,
+        status: int = 200,
+        headers: Optional[dict] = None,
+    ):
+        """
+        Registers a response. A route without a query string matches any query.
+
+        :param method: the HTTP method
+        :param route: the route, e.g. `/v2/matches`
+        :param response: the json payload, a `Response` or a callable taking method, route and
+        body that returns a `Response`
+        :param status: the status code of json payloads
+        :param headers: the headers of json payloads
+        """
+
+        if isinstance(response, (dict, list)):
+            response = Response(status, headers or {}, json.dumps(response).encode())
+        self._routes[(method, route)] = response
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Response:
+        parts = urlsplit(url)
+        route = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        with self._lock:
+            self.requests.append((method, route, body))
+        handler = self._routes.get((method, route), self._routes.get((method, parts.path)))
+        if handler is None:
+            return Response(404, {}, b"{}", url)
+        if callable(handler):
+            return handler(method, route, body)
+        return Response(handler.status_code, handler.headers, handler.content, url)